@@ -4,24 +4,38 @@
 import os
 import sys
 from datetime import datetime
-from dotenv import load_dotenv
 
 from chase_parser import parse_chase_csv
+from reconcile_state import ReconcileState
 from ynab_client import YNABClient
-from compare import TransactionMatcher
-
-load_dotenv()
+from matcher import TransactionMatcher
+from transfers import exclude_transfers
 
 
 def main():
     """Find discrepancies and ask for approval before making changes."""
-
     # Get configuration
-    chase_csv = sys.argv[1] if len(sys.argv) > 1 else None
-    if not chase_csv:
-        print("Usage: python add_missing_transactions.py <chase-csv-file>")
+    args = sys.argv[1:]
+    state_path = None
+    if "--reconcile-state" in args:
+        index = args.index("--reconcile-state")
+        state_path = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    pair_transfers = "--pair-transfers" in args
+    since_reconciled = "--since-reconciled" in args
+    files = [arg for arg in args if not arg.startswith("--")]
+    chase_csv = files[0] if files else None
+    if not chase_csv or ("--reconcile-state" in sys.argv and not state_path):
+        print(
+            "Usage: python add_missing_transactions.py <chase-csv-file> [--pair-transfers] "
+            "[--since-reconciled] [--reconcile-state PATH]"
+        )
         sys.exit(1)
 
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
     ynab_token = os.getenv("YNAB_TOKEN")
     budget_name = os.getenv("BUDGET_NAME")
     account_name = os.getenv("ACCOUNT_NAME")
@@ -65,13 +79,32 @@ def main():
         print(f"Account '{account_name}' not found")
         sys.exit(1)
 
+    # Everything up to the last reconciled date is already settled in YNAB, so
+    # with --since-reconciled only fetch what comes after it (the first run
+    # learns it from the data)
+    since_date = earliest_date.strftime('%Y-%m-%d')
+    if since_reconciled:
+        state = ReconcileState(state_path)
+        reconciled_since = state.since_date(budget_name, account_name)
+        if reconciled_since and reconciled_since > since_date:
+            since_date = reconciled_since
+
     # Get YNAB transactions and balance
     all_ynab_transactions = ynab.get_transactions(
         budget_id,
         account_id,
-        since_date=earliest_date.strftime('%Y-%m-%d')
+        since_date=since_date
     )
 
+    if since_reconciled:
+        reconciled_point = state.update(budget_name, account_name, all_ynab_transactions)
+        state.save()
+        if reconciled_point:
+            chase_transactions = [t for t in chase_transactions if t.date > reconciled_point]
+            all_ynab_transactions = [t for t in all_ynab_transactions if t.date > reconciled_point]
+            print(f"Reconciled through {reconciled_point.strftime('%Y-%m-%d')}; "
+                  f"comparing {len(chase_transactions)} later Chase transactions")
+
     # Filter to only unreconciled transactions (YNAB reconciliation logic)
     # When reconciling, you only work with transactions that aren't already reconciled
     ynab_transactions = [
@@ -148,6 +181,21 @@ def main():
         if t.date <= latest_chase_date
     ]
 
+    # Transfers between YNAB accounts won't show in the bank statement, so
+    # optionally never offer them for deletion
+    if pair_transfers:
+        budget_transactions = ynab.get_budget_transactions(
+            budget_id,
+            since_date=since_date
+        )
+        unmatched_ynab_to_investigate, transfer_pairs = exclude_transfers(
+            unmatched_ynab_to_investigate,
+            account_id,
+            budget_transactions
+        )
+        if transfer_pairs:
+            print(f"Ignoring {len(transfer_pairs)} transfers paired with other YNAB accounts")
+
     if not unmatched_chase and not unmatched_ynab_to_investigate:
         print("\n✅ Perfect! All transactions are reconciled.")
         sys.exit(0)
@@ -0,0 +1,245 @@
+"""Offline benchmark harness for parsing, matching and reporting.
+
+Generates synthetic data, times each pipeline stage, records peak memory
+with tracemalloc and compares the numbers against benchmarks/baselines.json.
+
+    python -m benchmarks.run --rows 1000 --rows 10000
+    python -m benchmarks.run --rows 1000 --update-baselines
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic_data import SyntheticConfig, generate, write_chase_csv
+from chase_parser import parse_chase_csv
+from exact_match import exact_match
+from matcher import TransactionMatcher, window_match
+from output_formats import JSONLinesWriter, write_result
+from parallel_match import parallel_match_transactions
+from reports import print_results
+from session import MatchResult
+from tolerance_sweep import sweep_tolerances
+from ynab_client import YNABClient
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# The fuzzy and window matchers scan every YNAB row per Chase row, so they are
+# skipped above this size unless --quadratic-max-rows is raised
+QUADRATIC_MAX_ROWS = 5000
+
+
+class StageResult:
+    """Throughput and memory for one stage at one dataset size."""
+
+    def __init__(self, stage: str, rows: int, seconds: float, peak_bytes: int):
+        self.stage = stage
+        self.rows = rows
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}@{self.rows}"
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    @property
+    def peak_kib(self) -> float:
+        return self.peak_bytes / 1024
+
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    """Time a stage (best of `repeat`), then run it once more under tracemalloc."""
+    best = None
+    for _ in range(repeat):
+        # Like timeit, keep garbage collection pauses out of the timings
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def _silent(func: Callable) -> Callable:
+    """Run a report printer with stdout discarded."""
+    def wrapper():
+        with redirect_stdout(io.StringIO()):
+            func()
+    return wrapper
+
+
+def run_benchmarks(rows: int, seed: int, repeat: int, quadratic_max_rows: int) -> List[StageResult]:
+    """Run every stage against a generated dataset of `rows` Chase rows."""
+    chase_rows, payload = generate(SyntheticConfig(rows=rows, seed=seed))
+    payload_json = json.dumps(payload)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chase_path = os.path.join(tmp, "chase.csv")
+        write_chase_csv(chase_rows, chase_path)
+
+        chase_transactions = parse_chase_csv(chase_path)
+        ynab_transactions = [
+            YNABClient._parse_transaction(t)
+            for t in payload["data"]["transactions"]
+        ]
+        matches, unmatched_chase, unmatched_ynab = exact_match(chase_transactions, ynab_transactions)
+        result = MatchResult("exact", 0, matches, unmatched_chase, unmatched_ynab)
+
+        class _Session:
+            chase_balance = chase_transactions[0].balance
+            ynab_balance = chase_transactions[0].balance
+
+        def parse_ynab():
+            data = json.loads(payload_json)
+            return [YNABClient._parse_transaction(t) for t in data["data"]["transactions"]]
+
+        def report_jsonl():
+            writer = JSONLinesWriter()
+            writer.stream = io.StringIO()
+            write_result(writer, _Session, result)
+
+        stages = {
+            "parse_chase": lambda: parse_chase_csv(chase_path),
+            "parse_ynab": parse_ynab,
+            "exact_match": lambda: exact_match(chase_transactions, ynab_transactions),
+            "tolerance_sweep": lambda: sweep_tolerances(chase_transactions, ynab_transactions, 7),
+            "fuzzy_match_sharded": lambda: parallel_match_transactions(
+                chase_transactions, ynab_transactions, tolerance_days=2, jobs=1
+            ),
+            "report_text": _silent(lambda: print_results(
+                _Session.chase_balance, _Session.ynab_balance, unmatched_chase, unmatched_ynab
+            )),
+            "report_jsonl": report_jsonl,
+        }
+        if rows <= quadratic_max_rows:
+            matcher = TransactionMatcher(tolerance_days=2)
+            stages["fuzzy_match"] = lambda: matcher.compare_transactions(chase_transactions, ynab_transactions)
+            stages["window_match"] = lambda: window_match(chase_transactions, ynab_transactions, tolerance_days=5)
+
+        results = []
+        for stage, func in stages.items():
+            measured = measure(func, repeat)
+            results.append(StageResult(stage, rows, measured["seconds"], measured["peak_bytes"]))
+
+    return results
+
+
+def load_baselines(path: str) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, baselines: Dict[str, Dict[str, float]]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing, matching and reporting offline")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        action="append",
+        help="Dataset size in Chase rows; repeat for several sizes (default: 1000 and 10000)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generator (default: 42)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage, best is kept (default: 5)")
+    parser.add_argument(
+        "--quadratic-max-rows",
+        type=int,
+        default=QUADRATIC_MAX_ROWS,
+        help=f"Largest size to run the O(n*m) matchers on (default: {QUADRATIC_MAX_ROWS})"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Allowed fractional slowdown or memory growth before failing (default: 0.5)"
+    )
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Baselines JSON file")
+    parser.add_argument("--update-baselines", action="store_true", help="Store these results as the new baselines")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    sizes = args.rows or [1000, 10000]
+    baselines = load_baselines(args.baselines)
+
+    results = []
+    for rows in sizes:
+        results.extend(run_benchmarks(rows, args.seed, args.repeat, args.quadratic_max_rows))
+
+    print(f"{'Stage':<18} {'Rows':>9} {'Rows/s':>14} {'Peak KiB':>12} {'vs baseline':>12}")
+    print("-" * 70)
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.key)
+        change = ""
+        if baseline:
+            speed_ratio = result.rows_per_sec / baseline["rows_per_sec"]
+            memory_ratio = result.peak_kib / baseline["peak_kib"] if baseline["peak_kib"] else 1.0
+            change = f"{speed_ratio:>10.2f}x"
+            if speed_ratio < 1 - args.threshold:
+                regressions.append(f"{result.key}: throughput {speed_ratio:.2f}x of baseline")
+            if memory_ratio > 1 + args.threshold:
+                regressions.append(f"{result.key}: peak memory {memory_ratio:.2f}x of baseline")
+        print(f"{result.stage:<18} {result.rows:>9} {result.rows_per_sec:>14,.0f} {result.peak_kib:>12,.1f} {change:>12}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([
+                {
+                    "stage": r.stage,
+                    "rows": r.rows,
+                    "seconds": r.seconds,
+                    "rows_per_sec": r.rows_per_sec,
+                    "peak_kib": r.peak_kib,
+                }
+                for r in results
+            ], f, indent=2)
+
+    if args.update_baselines:
+        for result in results:
+            baselines[result.key] = {
+                "rows_per_sec": round(result.rows_per_sec, 1),
+                "peak_kib": round(result.peak_kib, 1),
+            }
+        save_baselines(args.baselines, baselines)
+        print(f"\nUpdated baselines in {args.baselines}")
+        return
+
+    if regressions:
+        print("\nRegressions:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Seeded generator for realistic Chase CSV exports and YNAB API payloads.
+
+    python -m benchmarks.synthetic_data --rows 10000 --out data/synthetic
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+CHASE_FIELDS = ["Details", "Posting Date", "Description", "Amount", "Type", "Balance", "Check or Slip #"]
+
+# (description, chase type, typical amount range, outflow?)
+MERCHANTS = [
+    ("STARBUCKS STORE 12345", "DEBIT_CARD", (3, 12), True),
+    ("WHOLEFDS MKT 10234", "DEBIT_CARD", (20, 250), True),
+    ("AMAZON MKTPL*2K3L4M5N6", "DEBIT_CARD", (8, 300), True),
+    ("SHELL OIL 57442", "DEBIT_CARD", (25, 90), True),
+    ("NETFLIX.COM", "DEBIT_CARD", (15, 23), True),
+    ("CON ED OF NY INTELL CK", "ACH_DEBIT", (60, 240), True),
+    ("VERIZON WIRELESS PAYMENTS", "ACH_DEBIT", (80, 180), True),
+    ("Zelle payment to Alex", "QUICKPAY_DEBIT", (10, 500), True),
+    ("Online Transfer to SAV ...1234", "ACCT_XFER", (100, 5000), True),
+    ("CHECK", "CHECK_PAID", (50, 2500), True),
+    ("ACME CORP PAYROLL PPD ID: 1234567890", "ACH_CREDIT", (1500, 6000), False),
+    ("Zelle payment from Sam", "QUICKPAY_CREDIT", (10, 500), False),
+    ("ATM CASH DEPOSIT", "ATM_DEPOSIT", (20, 1000), False),
+]
+
+
+class SyntheticConfig:
+    """Knobs for the generated dataset."""
+
+    def __init__(
+        self,
+        rows: int = 1000,
+        seed: int = 42,
+        duplicate_rate: float = 0.02,
+        date_drift_days: int = 3,
+        split_rate: float = 0.05,
+        missing_rate: float = 0.01,
+        extra_rate: float = 0.01,
+        start_date: datetime = datetime(2022, 1, 1),
+        rows_per_day: float = 4.0
+    ):
+        """
+        Args:
+            rows: Number of Chase rows to generate
+            seed: Random seed; the same config always produces the same data
+            duplicate_rate: Fraction of rows repeated with the same date and amount
+            date_drift_days: Maximum days a YNAB date differs from the Chase date
+            split_rate: Fraction of YNAB transactions that are split into subtransactions
+            missing_rate: Fraction of Chase rows with no YNAB counterpart
+            extra_rate: Fraction of extra YNAB-only transactions
+            start_date: Date of the oldest transaction
+            rows_per_day: Average number of transactions per day
+        """
+        self.rows = rows
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.date_drift_days = date_drift_days
+        self.split_rate = split_rate
+        self.missing_rate = missing_rate
+        self.extra_rate = extra_rate
+        self.start_date = start_date
+        self.rows_per_day = rows_per_day
+
+
+def _amount(rng: random.Random, low: int, high: int) -> Decimal:
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _ynab_transaction(rng: random.Random, date: datetime, amount: Decimal, payee: str, account_id: str) -> Dict:
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "date": date.strftime("%Y-%m-%d"),
+        "amount": int(amount * 1000),
+        "memo": None,
+        "cleared": rng.choice(["cleared", "cleared", "reconciled", "uncleared"]),
+        "approved": True,
+        "account_id": account_id,
+        "payee_name": payee,
+        "transfer_account_id": None,
+        "transfer_transaction_id": None,
+        "deleted": False,
+        "subtransactions": [],
+    }
+
+
+def _split(rng: random.Random, transaction: Dict) -> None:
+    """Split a YNAB transaction into two or three subtransactions."""
+    parts = rng.randint(2, 3)
+    remaining = transaction["amount"]
+    subtransactions = []
+    for i in range(parts):
+        amount = remaining if i == parts - 1 else int(remaining * rng.uniform(0.2, 0.6)) // 10 * 10
+        remaining -= amount
+        subtransactions.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "transaction_id": transaction["id"],
+            "amount": amount,
+            "memo": None,
+            "deleted": False,
+        })
+    transaction["subtransactions"] = subtransactions
+
+
+def generate(config: SyntheticConfig) -> Tuple[List[Dict], Dict]:
+    """
+    Generate a Chase export and the matching YNAB API response.
+
+    Args:
+        config: SyntheticConfig describing the dataset
+
+    Returns:
+        Tuple of (chase_rows, ynab_payload); chase_rows are CSV dicts, newest first
+    """
+    rng = random.Random(config.seed)
+    account_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+    chase = []
+    ynab = []
+    balance = Decimal("10000.00")
+    date = config.start_date
+
+    while len(chase) < config.rows:
+        if rng.random() < 1 / config.rows_per_day:
+            date += timedelta(days=1)
+        description, trans_type, (low, high), outflow = rng.choice(MERCHANTS)
+        amount = _amount(rng, low, high)
+        if outflow:
+            amount = -amount
+        if trans_type == "CHECK_PAID":
+            description = f"CHECK {rng.randint(100, 9999)}"
+
+        copies = 2 if rng.random() < config.duplicate_rate else 1
+        for _ in range(copies):
+            if len(chase) >= config.rows:
+                break
+            balance += amount
+            chase.append({
+                "Details": "DEBIT" if amount < 0 else "CREDIT",
+                "Posting Date": date.strftime("%m/%d/%Y"),
+                "Description": description,
+                "Amount": f"{amount:.2f}",
+                "Type": trans_type,
+                "Balance": f"{balance:.2f}",
+                "Check or Slip #": "",
+            })
+
+            if rng.random() < config.missing_rate:
+                continue
+            drift = rng.randint(-config.date_drift_days, config.date_drift_days) if config.date_drift_days else 0
+            transaction = _ynab_transaction(rng, date + timedelta(days=drift), amount, description.title()[:50], account_id)
+            if rng.random() < config.split_rate:
+                _split(rng, transaction)
+            ynab.append(transaction)
+
+        if rng.random() < config.extra_rate:
+            _, _, (low, high), _ = rng.choice(MERCHANTS)
+            ynab.append(_ynab_transaction(rng, date, -_amount(rng, low, high), "Manual Entry", account_id))
+
+    # Chase exports are newest first; YNAB returns oldest first
+    chase.reverse()
+    ynab.sort(key=lambda t: t["date"])
+
+    payload = {
+        "data": {
+            "transactions": ynab,
+            "server_knowledge": len(ynab),
+        }
+    }
+    return chase, payload
+
+
+def write_chase_csv(rows: List[Dict], path: str):
+    """Write Chase rows in the bank's CSV export layout."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CHASE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_ynab_json(payload: Dict, path: str):
+    """Write a YNAB API response body."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Chase and YNAB data")
+    parser.add_argument("--rows", type=int, default=1000, help="Number of Chase rows (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.02, help="Same-day same-amount duplicate rate")
+    parser.add_argument("--date-drift", type=int, default=3, help="Maximum YNAB date drift in days")
+    parser.add_argument("--split-rate", type=float, default=0.05, help="Fraction of split YNAB transactions")
+    parser.add_argument("--out", default="data/synthetic", help="Output directory (default: data/synthetic)")
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        rows=args.rows,
+        seed=args.seed,
+        duplicate_rate=args.duplicate_rate,
+        date_drift_days=args.date_drift,
+        split_rate=args.split_rate
+    )
+    chase_rows, payload = generate(config)
+
+    os.makedirs(args.out, exist_ok=True)
+    chase_path = os.path.join(args.out, "chase.csv")
+    ynab_path = os.path.join(args.out, "ynab_transactions.json")
+    write_chase_csv(chase_rows, chase_path)
+    write_ynab_json(payload, ynab_path)
+
+    print(f"Wrote {len(chase_rows)} Chase rows to {chase_path}")
+    print(f"Wrote {len(payload['data']['transactions'])} YNAB transactions to {ynab_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""Local stand-in for the YNAB API, for offline load testing and benchmarks.
+
+Implements the endpoints YNABClient uses (budgets, accounts, account and
+budget transactions, create and delete, server_knowledge deltas) on top of
+an in-memory budget seeded from synthetic data or a recorded fixture.
+Latency, 429s and 5xx errors can be injected.
+
+    python -m benchmarks.ynab_stub_server --rows 10000 --chase-out data/synthetic/chase.csv
+    YNAB_BASE_URL=http://127.0.0.1:8765/v1 python compare.py --chase data/synthetic/chase.csv \\
+        --ynab-token test --budget-name "Synthetic Budget" --account-name "Synthetic Checking"
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic_data import SyntheticConfig, generate, write_chase_csv
+
+SYNTHETIC_BUDGET_NAME = "Synthetic Budget"
+SYNTHETIC_ACCOUNT_NAME = "Synthetic Checking"
+
+
+class StubBudget:
+    """One budget's accounts and transactions, with YNAB-style server knowledge."""
+
+    def __init__(self, budget_id: str, name: str):
+        self.id = budget_id
+        self.name = name
+        self.accounts: Dict[str, Dict] = {}
+        self.transactions: Dict[str, Dict] = {}
+        self.knowledge: Dict[str, int] = {}  # transaction id -> server knowledge when last changed
+        self.server_knowledge = 0
+
+    def add_account(self, account_id: str, name: str):
+        self.accounts[account_id] = {"id": account_id, "name": name, "type": "checking", "closed": False}
+
+    def put_transaction(self, transaction: Dict):
+        self.server_knowledge += 1
+        self.transactions[transaction["id"]] = transaction
+        self.knowledge[transaction["id"]] = self.server_knowledge
+
+    def account_payload(self, account: Dict) -> Dict:
+        """Account dict with balances computed from its transactions (milliunits)."""
+        cleared = 0
+        uncleared = 0
+        for trans in self.transactions.values():
+            if trans["account_id"] != account["id"] or trans.get("deleted"):
+                continue
+            if trans["cleared"] in ("cleared", "reconciled"):
+                cleared += trans["amount"]
+            else:
+                uncleared += trans["amount"]
+        payload = dict(account)
+        payload.update({
+            "balance": cleared + uncleared,
+            "cleared_balance": cleared,
+            "uncleared_balance": uncleared,
+            "deleted": False,
+        })
+        return payload
+
+    def select_transactions(
+        self,
+        account_id: Optional[str],
+        since_date: Optional[str],
+        last_knowledge: Optional[int]
+    ) -> List[Dict]:
+        """Transactions matching the query, oldest first, as the API returns them."""
+        selected = []
+        for trans_id, trans in self.transactions.items():
+            if account_id and trans["account_id"] != account_id:
+                continue
+            if since_date and trans["date"] < since_date:
+                continue
+            if last_knowledge is not None:
+                # Delta requests include deletions so clients can drop them
+                if self.knowledge[trans_id] <= last_knowledge:
+                    continue
+            elif trans.get("deleted"):
+                continue
+            selected.append(trans)
+        selected.sort(key=lambda t: t["date"])
+        return selected
+
+
+class StubState:
+    """All budgets served by the stub, plus fault injection settings."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_window: float = 3600.0,
+        token: Optional[str] = None,
+        seed: int = 0
+    ):
+        """
+        Args:
+            latency: Seconds added to every response
+            jitter: Extra random latency, up to this many seconds
+            rate_429: Probability of answering 429 Too Many Requests
+            error_rate: Probability of answering 500 Internal Server Error
+            rate_limit: Requests allowed per rate_window before further
+                requests get a 429, like the real API (default: no limit)
+            rate_window: Length of the rolling rate limit window in seconds
+            token: If set, only this bearer token is accepted
+            seed: Seed for latency jitter and fault injection
+        """
+        self.budgets: Dict[str, StubBudget] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.token = token
+        self.requests_served = 0
+        self._recent: deque = deque()
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def add_budget(self, name: str, budget_id: Optional[str] = None) -> StubBudget:
+        budget = StubBudget(budget_id or str(uuid.uuid4()), name)
+        self.budgets[budget.id] = budget
+        return budget
+
+    def load_fixture(self, path: str):
+        """
+        Load a recorded fixture.
+
+        Accepts either a state dump ({"budgets": [{"id", "name", "accounts",
+        "transactions"}]}) or a raw YNAB transactions response, which is put in
+        a single budget with one account per account_id.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+
+        if "budgets" in fixture:
+            for budget_data in fixture["budgets"]:
+                budget = self.add_budget(budget_data["name"], budget_data.get("id"))
+                for account in budget_data.get("accounts", []):
+                    budget.add_account(account["id"], account["name"])
+                for trans in budget_data.get("transactions", []):
+                    budget.put_transaction(trans)
+            return
+
+        budget = self.add_budget(SYNTHETIC_BUDGET_NAME)
+        for trans in fixture.get("data", {}).get("transactions", []):
+            if trans["account_id"] not in budget.accounts:
+                name = SYNTHETIC_ACCOUNT_NAME if not budget.accounts else f"Account {len(budget.accounts) + 1}"
+                budget.add_account(trans["account_id"], name)
+            budget.put_transaction(trans)
+
+    def load_synthetic(self, config: SyntheticConfig, chase_out: Optional[str] = None):
+        """Seed a budget from the synthetic generator, optionally writing the matching Chase CSV."""
+        chase_rows, payload = generate(config)
+        transactions = payload["data"]["transactions"]
+
+        budget = self.add_budget(SYNTHETIC_BUDGET_NAME)
+        if transactions:
+            budget.add_account(transactions[0]["account_id"], SYNTHETIC_ACCOUNT_NAME)
+        for trans in transactions:
+            budget.put_transaction(trans)
+
+        if chase_out:
+            write_chase_csv(chase_rows, chase_out)
+
+    @property
+    def rate_used(self) -> int:
+        """Requests counted against the rate limit in the current window."""
+        return len(self._recent)
+
+    def inject(self) -> Tuple[float, Optional[int]]:
+        """Pick the delay and any injected failure status for one request."""
+        with self.lock:
+            self.requests_served += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= self.rate_window:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit:
+                    return delay, 429
+                self._recent.append(now)
+            roll = self._rng.random()
+            if roll < self.rate_429:
+                return delay, 429
+            if roll < self.rate_429 + self.error_rate:
+                return delay, 500
+            return delay, None
+
+
+def _error(status: int, name: str, detail: str) -> Dict:
+    return {"error": {"id": str(status), "name": name, "detail": detail}}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Routes /v1/... requests to the shared StubState."""
+
+    state: StubState = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.state.rate_limit is not None:
+            self.send_header("X-Rate-Limit", f"{self.state.rate_used}/{self.state.rate_limit}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _handle(self, method: str):
+        delay, failure = self.state.inject()
+        if delay:
+            time.sleep(delay)
+
+        # Always drain the request body so keep-alive connections stay in sync
+        body = self._read_body() if method == "POST" else {}
+
+        if self.state.token and self.headers.get("Authorization") != f"Bearer {self.state.token}":
+            return self._send(401, _error(401, "unauthorized", "Unauthorized"))
+        if failure == 429:
+            return self._send(429, _error(429, "too_many_requests", "Too many requests"), {"Retry-After": "1"})
+        if failure == 500:
+            return self._send(500, _error(500, "internal_server_error", "Injected error"))
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:1] != ["v1"]:
+            return self._send(404, _error(404, "not_found", "Not found"))
+        parts = parts[1:]
+
+        with self.state.lock:
+            status, payload = self._route(method, parts, query, body)
+        self._send(status, payload)
+
+    def _route(self, method: str, parts: List[str], query: Dict, body: Dict) -> Tuple[int, Dict]:
+        if parts == ["budgets"] and method == "GET":
+            budgets = [{"id": b.id, "name": b.name} for b in self.state.budgets.values()]
+            return 200, {"data": {"budgets": budgets, "default_budget": None}}
+
+        if len(parts) < 2 or parts[0] != "budgets" or parts[1] not in self.state.budgets:
+            return 404, _error(404, "not_found", "Resource not found")
+        budget = self.state.budgets[parts[1]]
+        rest = parts[2:]
+
+        last_knowledge = query.get("last_knowledge_of_server")
+        last_knowledge = int(last_knowledge) if last_knowledge is not None else None
+        since_date = query.get("since_date")
+
+        if rest == ["accounts"] and method == "GET":
+            accounts = [budget.account_payload(a) for a in budget.accounts.values()]
+            return 200, {"data": {"accounts": accounts, "server_knowledge": budget.server_knowledge}}
+
+        if len(rest) == 3 and rest[0] == "accounts" and rest[2] == "transactions" and method == "GET":
+            if rest[1] not in budget.accounts:
+                return 404, _error(404, "not_found", "Account not found")
+            transactions = budget.select_transactions(rest[1], since_date, last_knowledge)
+            return 200, {"data": {"transactions": transactions, "server_knowledge": budget.server_knowledge}}
+
+        if rest == ["transactions"] and method == "GET":
+            transactions = budget.select_transactions(None, since_date, last_knowledge)
+            return 200, {"data": {"transactions": transactions, "server_knowledge": budget.server_knowledge}}
+
+        if rest == ["transactions"] and method == "POST":
+            return self._create(budget, body)
+
+        if len(rest) == 2 and rest[0] == "transactions" and method == "DELETE":
+            trans = budget.transactions.get(rest[1])
+            if trans is None or trans.get("deleted"):
+                return 404, _error(404, "not_found", "Transaction not found")
+            trans = dict(trans, deleted=True)
+            budget.put_transaction(trans)
+            return 200, {"data": {"transaction": trans, "server_knowledge": budget.server_knowledge}}
+
+        return 404, _error(404, "not_found", "Resource not found")
+
+    def _create(self, budget: StubBudget, body: Dict) -> Tuple[int, Dict]:
+        single = "transaction" in body
+        requested = [body["transaction"]] if single else body.get("transactions", [])
+        created = []
+        for data in requested:
+            if data.get("account_id") not in budget.accounts:
+                return 400, _error(400, "bad_request", "Invalid account_id")
+            account = budget.accounts[data["account_id"]]
+            trans = {
+                "id": str(uuid.uuid4()),
+                "date": data["date"],
+                "amount": int(data["amount"]),
+                "memo": data.get("memo"),
+                "cleared": data.get("cleared", "uncleared"),
+                "approved": data.get("approved", False),
+                "account_id": account["id"],
+                "account_name": account["name"],
+                "payee_name": data.get("payee_name"),
+                "transfer_account_id": None,
+                "transfer_transaction_id": None,
+                "deleted": False,
+                "subtransactions": [],
+            }
+            budget.put_transaction(trans)
+            created.append(trans)
+
+        response = {"transaction_ids": [t["id"] for t in created], "server_knowledge": budget.server_knowledge}
+        if single:
+            response["transaction"] = created[0]
+        else:
+            response["transactions"] = created
+        return 201, {"data": response}
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def make_server(state: StubState, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create a server for the given state; port 0 picks a free port."""
+    handler = type("BoundStubRequestHandler", (StubRequestHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(state: StubState, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread and return (server, base_url) for YNABClient."""
+    server = make_server(state, host, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the YNAB API")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--fixture", help="Seed from a recorded fixture JSON instead of synthetic data")
+    parser.add_argument("--rows", type=int, default=1000, help="Synthetic Chase rows to seed (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and fault injection (default: 42)")
+    parser.add_argument("--chase-out", help="Write the synthetic Chase CSV that matches the seeded budget here")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a 429 response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 response")
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        help="Requests allowed per --rate-window before responses are 429s (default: no limit; the real API allows 200)"
+    )
+    parser.add_argument(
+        "--rate-window",
+        type=float,
+        default=3600.0,
+        help="Rolling rate limit window in seconds (default: 3600)"
+    )
+    parser.add_argument("--token", help="Only accept this bearer token (default: accept any)")
+    args = parser.parse_args()
+
+    state = StubState(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        token=args.token,
+        seed=args.seed
+    )
+    if args.fixture:
+        state.load_fixture(args.fixture)
+    else:
+        state.load_synthetic(SyntheticConfig(rows=args.rows, seed=args.seed), chase_out=args.chase_out)
+
+    server = make_server(state, args.host, args.port)
+    for budget in state.budgets.values():
+        print(f"Budget '{budget.name}': {len(budget.accounts)} accounts, {len(budget.transactions)} transactions")
+    print(f"Serving YNAB stand-in at http://{args.host}:{server.server_address[1]}/v1 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
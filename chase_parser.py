@@ -1,9 +1,14 @@
 """Parse Chase bank CSV transaction exports."""
 
 import csv
+import io
+import os
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+# Bytes read from the end of a file by quick_date_range()
+TAIL_BYTES = 1 << 14
 
 
 class ChaseTransaction:
@@ -20,6 +25,23 @@ class ChaseTransaction:
         return f"ChaseTransaction(date={self.date.strftime('%Y-%m-%d')}, desc='{self.description}', amount={self.amount})"
 
 
+def _row_date(row: Dict) -> Optional[datetime]:
+    """Date of a CSV row, or None if it has no parseable date."""
+    # Chase CSV format can vary, so we'll handle common variations
+    date_str = row.get('Transaction Date') or row.get('Posting Date') or row.get('Date')
+    if not date_str:
+        return None
+
+    # Parse date (Chase typically uses MM/DD/YYYY)
+    try:
+        return datetime.strptime(date_str, '%m/%d/%Y')
+    except ValueError:
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return None
+
+
 def parse_chase_csv(filepath: str) -> List[ChaseTransaction]:
     """
     Parse a Chase CSV export file.
@@ -45,21 +67,10 @@ def parse_chase_csv(filepath: str) -> List[ChaseTransaction]:
         reader = csv.DictReader(f)
 
         for row in reader:
-            # Chase CSV format can vary, so we'll handle common variations
-            # Try to find the date column
-            date_str = row.get('Transaction Date') or row.get('Posting Date') or row.get('Date')
-            if not date_str:
+            trans_date = _row_date(row)
+            if trans_date is None:
                 continue
 
-            # Parse date (Chase typically uses MM/DD/YYYY)
-            try:
-                trans_date = datetime.strptime(date_str, '%m/%d/%Y')
-            except ValueError:
-                try:
-                    trans_date = datetime.strptime(date_str, '%Y-%m-%d')
-                except ValueError:
-                    continue
-
             # Get description
             description = row.get('Description', '').strip()
 
@@ -92,6 +103,49 @@ def parse_chase_csv(filepath: str) -> List[ChaseTransaction]:
     return transactions
 
 
+def quick_date_range(filepath: str, head_rows: int = 20) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Estimate an export's date range from its first and last rows.
+
+    Chase exports are sorted by date, so the head and tail of the file
+    cover both ends without parsing the rows in between. The result is a
+    guess for starting work early; parse_chase_csv() is authoritative.
+
+    Args:
+        filepath: Path to the Chase CSV file
+        head_rows: Number of rows to read from the start of the file
+
+    Returns:
+        (earliest, latest) dates seen, or (None, None) if none could be read
+    """
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        head = [f.readline() for _ in range(head_rows)]
+        head_end = f.tell()
+
+        size = os.fstat(f.fileno()).st_size
+        tail = []
+        if size > head_end:
+            f.seek(max(head_end, size - TAIL_BYTES))
+            if f.tell() != head_end:
+                # Drop the partial line we landed in
+                f.readline()
+            tail = f.readlines()
+
+    header = header.decode('utf-8-sig')
+    rows = b"".join(head + tail).decode('utf-8', errors='replace')
+    fieldnames = next(csv.reader([header]), [])
+    dates = []
+    for row in csv.DictReader(io.StringIO(rows), fieldnames=fieldnames):
+        date = _row_date(row)
+        if date is not None:
+            dates.append(date)
+
+    if not dates:
+        return None, None
+    return min(dates), max(dates)
+
+
 def get_date_range(transactions: List[ChaseTransaction]) -> tuple:
     """Get the date range from a list of transactions."""
     if not transactions:
@@ -104,3 +158,20 @@ def get_date_range(transactions: List[ChaseTransaction]) -> tuple:
 def calculate_total(transactions: List[ChaseTransaction]) -> Decimal:
     """Calculate the total amount from a list of transactions."""
     return sum(t.amount for t in transactions)
+
+
+def find_exports(directory: str) -> List[str]:
+    """
+    Paths of the CSV exports in a directory, sorted by name.
+
+    The extension is matched in any case, since Chase names its exports
+    *.CSV. A missing directory has no exports.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(".csv")
+            )
+    except FileNotFoundError:
+        return []
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Check that the CLI entry points import quickly and without the HTTP stack.
+
+Each module is imported in a fresh interpreter with `-X importtime`. The check
+fails if its cumulative import time exceeds the budget or if it pulls in a
+module that should only load when the network or an optional feature is used.
+
+    python check_startup.py [--budget-ms 50]
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Modules that must import cheaply (parse-only runs, --help, wrapper scripts)
+ENTRY_POINTS = ["compare", "add_missing_transactions", "session", "reports", "watch"]
+
+# Modules that should only be imported when YNAB is contacted or .env is read,
+# or by the option that needs them (--store, --pipeline, --jobs, --profile,
+# --metrics-file)
+LAZY_MODULES = {
+    "requests",
+    "urllib3",
+    "dotenv",
+    "sqlite3",
+    "concurrent.futures",
+    "multiprocessing",
+    "tracemalloc",
+    "tempfile",
+}
+
+# Tighter budgets for entry points that should stay well under the default
+BUDGETS_MS = {
+    "compare": 30.0,
+}
+
+
+def measure_import(module: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Only the module's own imports are returned, not those the interpreter
+    made at startup (e.g. site and .pth files).
+
+    Returns:
+        Tuple of (cumulative_import_microseconds, {imported_module: cumulative_us})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    # Each import is listed after the imports it triggered, so the module's
+    # own imports are the lines since the previous top-level import
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        imported[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            if name.strip() == module:
+                return int(cumulative), imported
+            imported = {}
+
+    return 0, {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time budget")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="Maximum cumulative import time per entry point in milliseconds (default: 50)"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Measure each entry point this many times and keep the fastest (default: 3)"
+    )
+    args = parser.parse_args()
+
+    failures = []
+    for module in ENTRY_POINTS:
+        best_us = None
+        imported = {}
+        for _ in range(args.runs):
+            elapsed_us, imported = measure_import(module)
+            best_us = elapsed_us if best_us is None else min(best_us, elapsed_us)
+
+        elapsed_ms = best_us / 1000
+        budget_ms = min(args.budget_ms, BUDGETS_MS.get(module, args.budget_ms))
+        eager = sorted(LAZY_MODULES & set(imported))
+        status = "ok"
+        if elapsed_ms > budget_ms:
+            status = "SLOW"
+            failures.append(f"{module} imports in {elapsed_ms:.1f}ms (budget {budget_ms:.0f}ms)")
+        if eager:
+            status = "EAGER"
+            failures.append(f"{module} imports {', '.join(eager)} at import time")
+
+        print(f"{module:<28} {elapsed_ms:>8.1f}ms  {status}")
+
+    if failures:
+        print("\nStartup check failed:", file=sys.stderr)
+        for failure in failures:
+            print(f"  - {failure}", file=sys.stderr)
+        sys.exit(1)
+
+    print("\nAll entry points within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,136 +4,31 @@
 import argparse
 import os
 import sys
+from contextlib import nullcontext, redirect_stdout
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Optional
 
-from dotenv import load_dotenv
+from http_metrics import HTTPMetrics
+from matcher import TransactionMatcher
+from profiling import StageProfiler
+from reconcile_state import ReconcileState
+from output_formats import FORMATS, open_writer, write_result, write_timings
+from reports import REPORTS, print_results
+from session import ReconciliationSession, STRATEGY_TOLERANCE_DAYS
+from tolerance_sweep import SWEEP_STRATEGIES, print_sweep, sweep_tolerances
 
-from chase_parser import parse_chase_csv, ChaseTransaction
-from ynab_client import YNABClient, YNABTransaction
-
-# Load environment variables from .env file
-load_dotenv()
-
-
-class TransactionMatcher:
-    """Match transactions between Chase and YNAB."""
-
-    def __init__(self, tolerance_days: int = 2, amount_tolerance: Decimal = Decimal("0.01")):
-        """
-        Initialize the matcher.
-
-        Args:
-            tolerance_days: Number of days to allow for date differences
-            amount_tolerance: Amount difference to tolerate (for floating point issues)
-        """
-        self.tolerance_days = tolerance_days
-        self.amount_tolerance = amount_tolerance
-
-    def find_match(
-        self,
-        chase_trans: ChaseTransaction,
-        ynab_transactions: List[YNABTransaction]
-    ) -> Tuple[bool, YNABTransaction | None]:
-        """
-        Find a matching YNAB transaction for a Chase transaction.
-
-        Args:
-            chase_trans: The Chase transaction to match
-            ynab_transactions: List of YNAB transactions to search
-
-        Returns:
-            Tuple of (found, matching_transaction)
-        """
-        for ynab_trans in ynab_transactions:
-            # Check if dates are within tolerance
-            date_diff = abs((chase_trans.date - ynab_trans.date).days)
-            if date_diff > self.tolerance_days:
-                continue
-
-            # Check if amounts match (YNAB uses negative for outflows)
-            # Chase might use negative for debits or positive for credits
-            amount_diff = abs(abs(chase_trans.amount) - abs(ynab_trans.amount))
-            if amount_diff > self.amount_tolerance:
-                continue
-
-            return True, ynab_trans
-
-        return False, None
-
-    def compare_transactions(
-        self,
-        chase_transactions: List[ChaseTransaction],
-        ynab_transactions: List[YNABTransaction]
-    ) -> Tuple[List[ChaseTransaction], List[YNABTransaction]]:
-        """
-        Compare two lists of transactions.
-
-        Args:
-            chase_transactions: List of Chase transactions
-            ynab_transactions: List of YNAB transactions
-
-        Returns:
-            Tuple of (unmatched_chase, unmatched_ynab)
-        """
-        unmatched_chase = []
-        matched_ynab_ids = set()
-
-        # Find Chase transactions without matches in YNAB
-        for chase_trans in chase_transactions:
-            found, ynab_match = self.find_match(chase_trans, ynab_transactions)
-            if found and ynab_match:
-                matched_ynab_ids.add(ynab_match.transaction_id)
-            else:
-                unmatched_chase.append(chase_trans)
-
-        # Find YNAB transactions without matches in Chase
-        unmatched_ynab = [
-            trans for trans in ynab_transactions
-            if trans.transaction_id not in matched_ynab_ids
-        ]
-
-        return unmatched_chase, unmatched_ynab
-
-
-def print_results(
-    chase_balance: Decimal,
-    ynab_balance: Decimal,
-    unmatched_chase: List[ChaseTransaction],
-    unmatched_ynab: List[YNABTransaction]
-):
-    """Print comparison results."""
-    print("\n" + "=" * 80)
-    print("BALANCE COMPARISON")
-    print("=" * 80)
-    print(f"Chase Balance:       ${chase_balance:,.2f}")
-    print(f"YNAB Balance:        ${ynab_balance:,.2f}")
-    print(f"Difference:          ${chase_balance - ynab_balance:,.2f}")
-
-    if unmatched_chase:
-        print("\n" + "=" * 80)
-        print(f"TRANSACTIONS IN CHASE BUT NOT IN YNAB ({len(unmatched_chase)})")
-        print("=" * 80)
-        for trans in sorted(unmatched_chase, key=lambda t: t.date):
-            print(f"{trans.date.strftime('%Y-%m-%d')} | ${trans.amount:>10.2f} | {trans.description}")
-
-    if unmatched_ynab:
-        print("\n" + "=" * 80)
-        print(f"TRANSACTIONS IN YNAB BUT NOT IN CHASE ({len(unmatched_ynab)})")
-        print("=" * 80)
-        for trans in sorted(unmatched_ynab, key=lambda t: t.date):
-            memo = f" ({trans.memo})" if trans.memo else ""
-            print(f"{trans.date.strftime('%Y-%m-%d')} | ${trans.amount:>10.2f} | {trans.payee_name}{memo}")
-
-    if not unmatched_chase and not unmatched_ynab:
-        print("\n" + "=" * 80)
-        print("All transactions matched!")
-        print("=" * 80)
+if TYPE_CHECKING:
+    from history_store import HistoryStore
 
 
 def main():
     """Main CLI entry point."""
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
     parser = argparse.ArgumentParser(
         description="Compare Chase bank transactions with YNAB transactions"
     )
@@ -157,6 +52,11 @@ def main():
         default=os.getenv("ACCOUNT_NAME"),
         help="Name of the YNAB account to compare (or set ACCOUNT_NAME in .env)"
     )
+    parser.add_argument(
+        "--ynab-base-url",
+        default=os.getenv("YNAB_BASE_URL"),
+        help="YNAB API root, e.g. a local stand-in server (or set YNAB_BASE_URL in .env)"
+    )
     parser.add_argument(
         "--date-from",
         help="Start date for comparison (YYYY-MM-DD)"
@@ -168,14 +68,122 @@ def main():
     parser.add_argument(
         "--tolerance-days",
         type=int,
-        default=2,
-        help="Number of days tolerance for date matching (default: 2)"
+        help="Number of days tolerance for date matching (default: 2, or 5 for the window strategy)"
+    )
+    parser.add_argument(
+        "--sweep-tolerance",
+        type=int,
+        metavar="DAYS",
+        help="Show match counts for every date tolerance from 0 to DAYS for each --strategy (fuzzy or window), then exit"
+    )
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        choices=sorted(STRATEGY_TOLERANCE_DAYS),
+        help="Matching strategy to run; repeat to run several (default: fuzzy)"
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Only match transactions with the same date and signed amount (same as --strategy exact)"
+    )
+    parser.add_argument(
+        "--report",
+        action="append",
+        choices=sorted(REPORTS),
+        help="Report to print for each strategy; repeat to print several (default: summary)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text"] + FORMATS,
+        default="text",
+        help="Output format (default: text); progress messages go to stderr for other formats"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write results to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, CPU time, calls and memory peak per pipeline stage to stderr"
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the per-stage profile to a JSON file"
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        metavar="PATH",
+        help="Also dump cProfile stats to this file (view with python -m pstats)"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write per-endpoint YNAB API metrics in Prometheus text format (e.g. for node_exporter)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=0,
+        help="Retry rate-limited (429) and server error responses this many times (default: 0)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Run the fuzzy strategy month by month in N processes (0 for every CPU core); "
+             "results are identical to the serial matcher"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Fetch from YNAB in background threads while the Chase CSV is parsed"
+    )
+    parser.add_argument(
+        "--since-reconciled",
+        action="store_true",
+        help="Only fetch and compare transactions after the account's last reconciled date, "
+             "learned from YNAB and remembered in the state file (ignored with --date-from)"
+    )
+    parser.add_argument(
+        "--reconcile-state",
+        metavar="PATH",
+        help="State file for --since-reconciled (default: RECONCILE_STATE in .env, or .reconcile_state.json)"
+    )
+    parser.add_argument(
+        "--store",
+        default=os.getenv("HISTORY_STORE"),
+        metavar="PATH",
+        help="SQLite history store; new data is added to it and the comparison reads the stored history "
+             "for --date-from/--date-to (or set HISTORY_STORE in .env)"
+    )
+    parser.add_argument(
+        "--skip-agreeing-months",
+        action="store_true",
+        help="With --store, leave out months whose Chase and YNAB counts and totals already agree"
+    )
+    parser.add_argument(
+        "--pair-transfers",
+        action="store_true",
+        help="Exclude YNAB transfers that pair with another account in the budget"
     )
 
     args = parser.parse_args()
 
+    if args.exact and args.strategy:
+        parser.error("--exact can't be combined with --strategy; use --strategy exact instead")
+    if args.sweep_tolerance is not None:
+        if args.exact or any(strategy not in SWEEP_STRATEGIES for strategy in args.strategy or []):
+            parser.error("--sweep-tolerance only applies to the fuzzy and window strategies")
+        if args.sweep_tolerance < 0:
+            parser.error("--sweep-tolerance must be 0 or more")
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs must be 0 or more")
+
     # Validate required arguments
-    if not args.chase:
+    if not args.chase and not args.store:
         print("Error: --chase argument is required (or set CHASE_CSV_PATH in .env)", file=sys.stderr)
         sys.exit(1)
     if not args.ynab_token:
@@ -188,87 +196,168 @@ def main():
         print("Error: --account-name argument is required (or set ACCOUNT_NAME in .env)", file=sys.stderr)
         sys.exit(1)
 
-    # Parse Chase CSV
-    print(f"Loading Chase transactions from {args.chase}...")
-    try:
-        chase_transactions = parse_chase_csv(args.chase)
-        print(f"Found {len(chase_transactions)} Chase transactions")
-    except Exception as e:
-        print(f"Error parsing Chase CSV: {e}", file=sys.stderr)
-        sys.exit(1)
+    # Keep stdout clean for machine-readable output
+    log = sys.stdout if args.format == "text" and not args.output else sys.stderr
+
+    profiling = args.profile or args.profile_json or args.profile_cprofile
+    profiler = StageProfiler(trace_memory=bool(profiling), cprofile_path=args.profile_cprofile)
+    http_metrics = HTTPMetrics()
+    session = ReconciliationSession(
+        args.chase,
+        args.ynab_token,
+        args.budget_name,
+        args.account_name,
+        profiler=profiler,
+        on_request=http_metrics,
+        max_retries=args.max_retries,
+        base_url=args.ynab_base_url,
+        jobs=args.jobs
+    )
 
-    # Get date range from Chase transactions
-    if not chase_transactions:
-        print("No transactions found in Chase CSV", file=sys.stderr)
-        sys.exit(1)
+    store = None
+    if args.store:
+        # sqlite3 is only loaded for --store runs
+        from history_store import HistoryStore
 
-    chase_dates = [t.date for t in chase_transactions]
-    earliest_chase_date = min(chase_dates)
-    latest_chase_date = max(chase_dates)
-    print(f"Chase CSV date range: {earliest_chase_date.strftime('%Y-%m-%d')} to {latest_chase_date.strftime('%Y-%m-%d')}")
+        store = HistoryStore(args.store)
 
-    # Connect to YNAB
-    print(f"Connecting to YNAB...")
+    profiler.start()
     try:
-        ynab = YNABClient(args.ynab_token)
-
-        # Get budget ID
-        budget_id = ynab.get_budget_id(args.budget_name)
-        if not budget_id:
-            print(f"Budget '{args.budget_name}' not found", file=sys.stderr)
-            sys.exit(1)
+        run_comparison(args, session, log, store)
+    finally:
+        profiler.stop()
+        if store:
+            store.close()
+        if args.profile:
+            profiler.print_summary()
+            http_metrics.print_summary()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+        if args.metrics_file:
+            http_metrics.write_prometheus(args.metrics_file)
+
+
+def run_comparison(
+    args: argparse.Namespace,
+    session: ReconciliationSession,
+    log,
+    store: Optional["HistoryStore"] = None
+):
+    """Load the data, match it and write the requested reports."""
+    date_from = datetime.strptime(args.date_from, "%Y-%m-%d") if args.date_from else None
+    date_to = datetime.strptime(args.date_to, "%Y-%m-%d") if args.date_to else None
+    strategies = args.strategy or (["exact"] if args.exact else ["fuzzy"])
 
-        # Get account ID
-        account_id = ynab.get_account_id(budget_id, args.account_name)
-        if not account_id:
-            print(f"Account '{args.account_name}' not found", file=sys.stderr)
-            sys.exit(1)
+    # Overlap parsing with the YNAB requests when asked to
+    pipelined = args.pipeline and session.chase_path and not args.since_reconciled
 
-        # Get transactions from YNAB starting from earliest Chase date
-        since_date = args.date_from if args.date_from else earliest_chase_date.strftime('%Y-%m-%d')
-        ynab_transactions = ynab.get_transactions(
-            budget_id,
-            account_id,
-            since_date=since_date
-        )
-        print(f"Found {len(ynab_transactions)} YNAB transactions since {since_date}")
+    # Parse Chase CSV, or read the stored history when no export is given
+    try:
+        if pipelined:
+            print(f"Loading Chase transactions from {session.chase_path} while fetching from YNAB...", file=log)
+            session.load_pipelined(since_date=args.date_from, pair_transfers=args.pair_transfers)
+            chase_transactions = session.chase_transactions
+        elif session.chase_path:
+            print(f"Loading Chase transactions from {session.chase_path}...", file=log)
+            chase_transactions = session.load_chase()
+        else:
+            print(f"Loading Chase transactions from {store.path}...", file=log)
+            chase_transactions = session.load_chase_from_store(store, date_from, date_to)
+        print(f"Found {len(chase_transactions)} Chase transactions", file=log)
+    except Exception as e:
+        print(f"Error loading data: {e}" if pipelined else f"Error parsing Chase CSV: {e}", file=sys.stderr)
+        sys.exit(1)
 
-        # Get YNAB balance
-        ynab_balance = ynab.get_account_balance(budget_id, account_id)
+    earliest_chase_date, latest_chase_date = session.date_range
+    print(f"Chase CSV date range: {earliest_chase_date.strftime('%Y-%m-%d')} to {latest_chase_date.strftime('%Y-%m-%d')}", file=log)
 
+    # Connect to YNAB and get transactions starting from earliest Chase date
+    print(f"Connecting to YNAB...", file=log)
+    point = None
+    try:
+        if pipelined:
+            ynab_transactions = session.ynab_transactions
+        elif args.since_reconciled and not args.date_from:
+            # Keep YNAB rows within the widest date tolerance before the reconciled point
+            margin_days = args.tolerance_days
+            if margin_days is None:
+                margin_days = max(STRATEGY_TOLERANCE_DAYS[strategy] for strategy in strategies)
+            point = session.load_ynab_since_reconciled(
+                ReconcileState(args.reconcile_state),
+                pair_transfers=args.pair_transfers,
+                margin_days=margin_days
+            )
+            if point:
+                print(f"Reconciled through {point.strftime('%Y-%m-%d')}; comparing later transactions only", file=log)
+            ynab_transactions = session.ynab_transactions
+        else:
+            ynab_transactions = session.load_ynab(since_date=args.date_from, pair_transfers=args.pair_transfers)
+        print(f"Found {len(ynab_transactions)} YNAB transactions since {session.since_date}", file=log)
     except Exception as e:
         print(f"Error connecting to YNAB: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Filter by date range if specified
-    if args.date_from or args.date_to:
-        date_from = datetime.strptime(args.date_from, "%Y-%m-%d") if args.date_from else None
-        date_to = datetime.strptime(args.date_to, "%Y-%m-%d") if args.date_to else None
-
-        if date_from:
-            chase_transactions = [t for t in chase_transactions if t.date >= date_from]
-            ynab_transactions = [t for t in ynab_transactions if t.date >= date_from]
-
-        if date_to:
-            chase_transactions = [t for t in chase_transactions if t.date <= date_to]
-            ynab_transactions = [t for t in ynab_transactions if t.date <= date_to]
+    if store:
+        # Compare against the full stored history, reading only the months in range
+        session.save_to_store(store)
+        skipped = session.load_from_store(store, date_from, date_to, skip_agreeing_months=args.skip_agreeing_months)
+        if point:
+            # The stored history also reaches back before the reconciled point
+            session.exclude_before_reconciled(point, margin_days=margin_days)
+        if skipped:
+            print(f"Skipped {len(skipped)} months whose totals already agree: {', '.join(skipped)}", file=log)
+        print(f"Read {len(session.chase_transactions)} Chase and {len(session.ynab_transactions)} YNAB transactions from {store.path}", file=log)
+    elif date_from or date_to:
+        # Filter by date range if specified
+        session.filter_dates(date_from, date_to)
 
     # Get Chase balance (from the most recent transaction)
-    chase_balance = chase_transactions[0].balance if chase_transactions else Decimal("0")
-    if chase_balance == Decimal("0"):
+    if session.chase_balance == Decimal("0"):
         # If balance not in CSV, calculate from transactions
-        print("Warning: Balance not found in Chase CSV, cannot compare balances accurately")
-
-    # Compare transactions
-    print("Comparing transactions...")
-    matcher = TransactionMatcher(tolerance_days=args.tolerance_days)
-    unmatched_chase, unmatched_ynab = matcher.compare_transactions(
-        chase_transactions,
-        ynab_transactions
-    )
-
-    # Print results
-    print_results(chase_balance, ynab_balance, unmatched_chase, unmatched_ynab)
+        print("Warning: Balance not found in Chase CSV, cannot compare balances accurately", file=log)
+
+    if args.sweep_tolerance is not None:
+        with session.profiler.stage("tolerance_sweep"):
+            for strategy in strategies:
+                results = sweep_tolerances(
+                    session.chase_transactions,
+                    session.ynab_transactions,
+                    args.sweep_tolerance,
+                    strategy=strategy,
+                    report_from=session.report_from
+                )
+                print_sweep(results, strategy)
+        return
+
+    reports = args.report or ["summary"]
+    # Name the strategy only when several run, so single runs print what they always did
+    label = "Comparing transactions ({})..." if len(strategies) > 1 else "Comparing transactions..."
+
+    if args.format != "text":
+        with open_writer(args.format, args.output) as writer:
+            for strategy in strategies:
+                print(label.format(strategy), file=log)
+                result = session.run(strategy, tolerance_days=args.tolerance_days)
+                with session.profiler.stage(f"write_{args.format}"):
+                    write_result(writer, session, result)
+            write_timings(writer, session.timings)
+        return
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else nullcontext(sys.stdout)
+    with out as stream, redirect_stdout(stream):
+        for strategy in strategies:
+            # Compare transactions
+            print(label.format(strategy), file=log)
+            result = session.run(strategy, tolerance_days=args.tolerance_days)
+
+            # Transfers between YNAB accounts never appear in the bank statement
+            if args.pair_transfers:
+                print(f"Excluded {len(result.transfer_pairs)} transfers paired with other YNAB accounts", file=log)
+
+            # Print results
+            for report in reports:
+                with session.profiler.stage(f"report_{report}"):
+                    REPORTS[report](session, result)
 
 
 if __name__ == "__main__":
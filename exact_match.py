@@ -0,0 +1,61 @@
+"""Exact (date, amount) matching between Chase and YNAB transactions."""
+
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from chase_parser import ChaseTransaction
+from ynab_client import YNABTransaction
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a currency amount to integer cents."""
+    return int((amount * 100).to_integral_value())
+
+
+def _build_multimap(transactions: List) -> Dict[Tuple[datetime, int], List]:
+    """Group transactions by (date, cents), keeping their original order."""
+    rows_by_key: Dict[Tuple[datetime, int], List] = {}
+    for trans in transactions:
+        rows_by_key.setdefault((trans.date, to_cents(trans.amount)), []).append(trans)
+    return rows_by_key
+
+
+def exact_match(
+    chase_transactions: List[ChaseTransaction],
+    ynab_transactions: List[YNABTransaction]
+) -> Tuple[List[Tuple[ChaseTransaction, YNABTransaction]], List[ChaseTransaction], List[YNABTransaction]]:
+    """
+    Match transactions that have exactly the same date and signed amount.
+
+    Keys are compared as multisets, so two identical Chase transactions on the
+    same day need two identical YNAB transactions to be fully matched.
+
+    Args:
+        chase_transactions: List of Chase transactions
+        ynab_transactions: List of YNAB transactions
+
+    Returns:
+        Tuple of (matches, unmatched_chase, unmatched_ynab)
+    """
+    chase_rows = _build_multimap(chase_transactions)
+    ynab_rows = _build_multimap(ynab_transactions)
+
+    chase_counts = Counter({key: len(rows) for key, rows in chase_rows.items()})
+    ynab_counts = Counter({key: len(rows) for key, rows in ynab_rows.items()})
+    matched_counts = chase_counts & ynab_counts
+
+    matches = []
+    for key, count in matched_counts.items():
+        matches.extend(zip(chase_rows[key][:count], ynab_rows[key][:count]))
+
+    unmatched_chase = []
+    for key, surplus in (chase_counts - ynab_counts).items():
+        unmatched_chase.extend(chase_rows[key][-surplus:])
+
+    unmatched_ynab = []
+    for key, surplus in (ynab_counts - chase_counts).items():
+        unmatched_ynab.extend(ynab_rows[key][-surplus:])
+
+    return matches, unmatched_chase, unmatched_ynab
@@ -0,0 +1,390 @@
+"""Local SQLite store of Chase and YNAB history, partitioned by month.
+
+Every transaction is stored with its month ("YYYY-MM") and a partitions
+table keeps the row count, min/max date and amount sum per (source,
+account, month). Date range queries only read the overlapping months, and
+months whose Chase and YNAB sums already agree can be skipped entirely.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set
+
+from chase_parser import ChaseTransaction
+from ynab_client import YNABTransaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chase_transactions (
+    account TEXT NOT NULL,
+    month TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount_milliunits INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    type TEXT NOT NULL,
+    balance_milliunits INTEGER NOT NULL,
+    occurrence INTEGER NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, date, amount_milliunits, description, balance_milliunits, occurrence)
+);
+CREATE INDEX IF NOT EXISTS chase_by_month ON chase_transactions (account, month);
+
+CREATE TABLE IF NOT EXISTS ynab_transactions (
+    id TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    month TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount_milliunits INTEGER NOT NULL,
+    payee_name TEXT,
+    memo TEXT,
+    cleared TEXT,
+    account_id TEXT,
+    transfer_account_id TEXT,
+    transfer_transaction_id TEXT
+);
+CREATE INDEX IF NOT EXISTS ynab_by_month ON ynab_transactions (account, month);
+
+CREATE TABLE IF NOT EXISTS partitions (
+    source TEXT NOT NULL,
+    account TEXT NOT NULL,
+    month TEXT NOT NULL,
+    min_date TEXT NOT NULL,
+    max_date TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    sum_milliunits INTEGER NOT NULL,
+    PRIMARY KEY (source, account, month)
+);
+"""
+
+SOURCES = {
+    "chase": "chase_transactions",
+    "ynab": "ynab_transactions",
+}
+
+
+def _milliunits(amount: Decimal) -> int:
+    return int((amount * 1000).to_integral_value())
+
+
+def _month(date: datetime) -> str:
+    return date.strftime("%Y-%m")
+
+
+class Partition:
+    """Summary of one month of one source."""
+
+    def __init__(self, source: str, month: str, min_date: str, max_date: str, row_count: int, sum_milliunits: int):
+        self.source = source
+        self.month = month
+        self.min_date = min_date
+        self.max_date = max_date
+        self.row_count = row_count
+        self.sum_milliunits = sum_milliunits
+
+    @property
+    def total(self) -> Decimal:
+        return Decimal(self.sum_milliunits) / 1000
+
+    def __repr__(self):
+        return f"Partition({self.source} {self.month}, rows={self.row_count}, total={self.total})"
+
+
+class HistoryStore:
+    """Month-partitioned transaction history in a single SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        # Stores created before rows kept their position within the day
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(chase_transactions)")}
+        if "position" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE chase_transactions ADD COLUMN position INTEGER NOT NULL DEFAULT 0")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def ingest_chase(self, account: str, transactions: List[ChaseTransaction]) -> int:
+        """
+        Add rows from a Chase export. Rows already stored from an overlapping
+        export are ignored; genuine same-day duplicates within one export are
+        kept by numbering identical rows. Each row's position within its day
+        is kept too, so reads list same-day rows in the export's order.
+
+        Returns:
+            Number of new rows
+        """
+        seen: Dict[tuple, int] = {}
+        day_positions: Dict[str, int] = {}
+        rows = []
+        for trans in transactions:
+            key = (
+                trans.date.strftime("%Y-%m-%d"),
+                _milliunits(trans.amount),
+                trans.description,
+                _milliunits(trans.balance),
+            )
+            occurrence = seen.get(key, 0)
+            seen[key] = occurrence + 1
+            position = day_positions.get(key[0], 0)
+            day_positions[key[0]] = position + 1
+            rows.append(
+                (account, _month(trans.date)) + key[:3] + (trans.transaction_type,) + key[3:] + (occurrence, position)
+            )
+
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO chase_transactions "
+                "(account, month, date, amount_milliunits, description, type, balance_milliunits, occurrence, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            added = self.conn.total_changes - before
+            self._refresh_partitions("chase", account, {row[1] for row in rows})
+        return added
+
+    def ingest_ynab(self, account: str, transactions: List[YNABTransaction], since_date: Optional[str] = None) -> int:
+        """
+        Add or update YNAB transactions by ID.
+
+        Args:
+            account: Account name the transactions belong to
+            transactions: Transactions from the API
+            since_date: If the transactions are a full fetch since this date
+                (YYYY-MM-DD), stored rows on or after it that are missing from
+                the fetch were deleted in YNAB and are removed
+
+        Returns:
+            Number of rows written
+        """
+        rows = [
+            (
+                trans.transaction_id,
+                account,
+                _month(trans.date),
+                trans.date.strftime("%Y-%m-%d"),
+                _milliunits(trans.amount),
+                trans.payee_name,
+                trans.memo,
+                trans.cleared,
+                trans.account_id,
+                trans.transfer_account_id,
+                trans.transfer_transaction_id,
+            )
+            for trans in transactions
+        ]
+
+        with self.conn:
+            # A transaction whose date changed moves out of its old month
+            months = self._months_of_ids([row[0] for row in rows])
+            if since_date:
+                fetched = {row[0] for row in rows}
+                stale = [
+                    (trans_id, month) for trans_id, month in self.conn.execute(
+                        "SELECT id, month FROM ynab_transactions WHERE account = ? AND date >= ?",
+                        (account, since_date)
+                    )
+                    if trans_id not in fetched
+                ]
+                self.conn.executemany("DELETE FROM ynab_transactions WHERE id = ?", [(i,) for i, _ in stale])
+                months.update(month for _, month in stale)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ynab_transactions "
+                "(id, account, month, date, amount_milliunits, payee_name, memo, cleared, "
+                "account_id, transfer_account_id, transfer_transaction_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            months.update(row[2] for row in rows)
+            self._refresh_partitions("ynab", account, months)
+        return len(rows)
+
+    def delete_ynab(self, account: str, transaction_ids: Iterable[str]):
+        """Remove YNAB transactions (e.g. deleted in a delta response)."""
+        ids = list(transaction_ids)
+        with self.conn:
+            months = self._months_of_ids(ids)
+            self.conn.executemany("DELETE FROM ynab_transactions WHERE id = ?", [(i,) for i in ids])
+            self._refresh_partitions("ynab", account, months)
+
+    def _months_of_ids(self, ids: List[str]) -> Set[str]:
+        months = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            months.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT DISTINCT month FROM ynab_transactions WHERE id IN ({placeholders})",
+                    chunk
+                )
+            )
+        return months
+
+    def _refresh_partitions(self, source: str, account: str, months: Set[str]):
+        table = SOURCES[source]
+        for month in months:
+            row = self.conn.execute(
+                f"SELECT MIN(date), MAX(date), COUNT(*), COALESCE(SUM(amount_milliunits), 0) "
+                f"FROM {table} WHERE account = ? AND month = ?",
+                (account, month)
+            ).fetchone()
+            if row[2] == 0:
+                self.conn.execute(
+                    "DELETE FROM partitions WHERE source = ? AND account = ? AND month = ?",
+                    (source, account, month)
+                )
+                continue
+            self.conn.execute(
+                "INSERT OR REPLACE INTO partitions "
+                "(source, account, month, min_date, max_date, row_count, sum_milliunits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source, account, month) + tuple(row)
+            )
+
+    def partitions(
+        self,
+        source: str,
+        account: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> List[Partition]:
+        """Month partitions of a source that overlap the date range."""
+        query = (
+            "SELECT month, min_date, max_date, row_count, sum_milliunits FROM partitions "
+            "WHERE source = ? AND account = ?"
+        )
+        params = [source, account]
+        if date_from:
+            query += " AND max_date >= ?"
+            params.append(date_from.strftime("%Y-%m-%d"))
+        if date_to:
+            query += " AND min_date <= ?"
+            params.append(date_to.strftime("%Y-%m-%d"))
+        query += " ORDER BY month"
+        return [Partition(source, *row) for row in self.conn.execute(query, params)]
+
+    def agreeing_months(
+        self,
+        account: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Months where both sources have the same row count and amount sum.
+
+        Only months entirely inside the date range are considered, since a
+        partial month's totals don't describe the rows being compared.
+        """
+        chase = {p.month: p for p in self.partitions("chase", account, date_from, date_to)}
+        ynab = {p.month: p for p in self.partitions("ynab", account, date_from, date_to)}
+
+        months = []
+        for month, partition in chase.items():
+            other = ynab.get(month)
+            if other is None:
+                continue
+            if date_from and month == _month(date_from) and date_from.day != 1:
+                continue
+            if date_to and month == _month(date_to) and (date_to + timedelta(days=1)).day != 1:
+                continue
+            if partition.row_count == other.row_count and partition.sum_milliunits == other.sum_milliunits:
+                months.append(month)
+        return months
+
+    def _months_in_range(
+        self,
+        source: str,
+        account: str,
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        skip_months: Iterable[str]
+    ) -> List[str]:
+        skip = set(skip_months)
+        return [p.month for p in self.partitions(source, account, date_from, date_to) if p.month not in skip]
+
+    def _select(self, source: str, columns: str, account: str, months: List[str], date_from, date_to, order: str):
+        table = SOURCES[source]
+        rows = []
+        for month in months:
+            query = f"SELECT {columns} FROM {table} WHERE account = ? AND month = ?"
+            params = [account, month]
+            if date_from:
+                query += " AND date >= ?"
+                params.append(date_from.strftime("%Y-%m-%d"))
+            if date_to:
+                query += " AND date <= ?"
+                params.append(date_to.strftime("%Y-%m-%d"))
+            rows.extend(self.conn.execute(query + f" ORDER BY {order}", params))
+        return rows
+
+    def load_chase(
+        self,
+        account: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        skip_months: Iterable[str] = ()
+    ) -> List[ChaseTransaction]:
+        """Chase transactions in the date range, newest first like a Chase export."""
+        months = self._months_in_range("chase", account, date_from, date_to, skip_months)
+        rows = self._select(
+            "chase",
+            "date, description, amount_milliunits, type, balance_milliunits",
+            account,
+            list(reversed(months)),
+            date_from,
+            date_to,
+            "date DESC, position, occurrence"
+        )
+        return [
+            ChaseTransaction(
+                date=datetime.strptime(date, "%Y-%m-%d"),
+                description=description,
+                amount=Decimal(amount) / 1000,
+                transaction_type=trans_type,
+                balance=Decimal(balance) / 1000
+            )
+            for date, description, amount, trans_type, balance in rows
+        ]
+
+    def load_ynab(
+        self,
+        account: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        skip_months: Iterable[str] = ()
+    ) -> List[YNABTransaction]:
+        """YNAB transactions in the date range, oldest first like the API."""
+        months = self._months_in_range("ynab", account, date_from, date_to, skip_months)
+        rows = self._select(
+            "ynab",
+            "id, date, amount_milliunits, payee_name, memo, cleared, account_id, "
+            "transfer_account_id, transfer_transaction_id",
+            account,
+            months,
+            date_from,
+            date_to,
+            "date"
+        )
+        return [
+            YNABTransaction(
+                date=datetime.strptime(date, "%Y-%m-%d"),
+                payee_name=payee_name,
+                amount=Decimal(amount) / 1000,
+                memo=memo,
+                cleared=cleared,
+                transaction_id=trans_id,
+                account_id=account_id,
+                transfer_account_id=transfer_account_id,
+                transfer_transaction_id=transfer_transaction_id
+            )
+            for (trans_id, date, amount, payee_name, memo, cleared, account_id,
+                 transfer_account_id, transfer_transaction_id) in rows
+        ]
@@ -0,0 +1,147 @@
+"""Aggregate YNABClient request events and export them for monitoring."""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from ynab_client import RequestEvent
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+class EndpointMetrics:
+    """Counters for one (method, endpoint template) pair."""
+
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.count = 0
+        self.seconds_total = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.response_bytes = 0
+        self.retries = 0
+        self.status_codes: Dict[str, int] = {}
+
+    def observe(self, event: RequestEvent):
+        self.count += 1
+        self.seconds_total += event.seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if event.seconds <= bound:
+                self.bucket_counts[i] += 1
+        self.response_bytes += event.response_bytes
+        self.retries += event.retries
+        status = str(event.status_code) if event.status_code is not None else "error"
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+
+class HTTPMetrics:
+    """
+    Per-endpoint request metrics.
+
+    Pass an instance as YNABClient's on_request callback. Safe to share
+    between threads.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self.rate_limit_used: Optional[int] = None
+        self.rate_limit_total: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        with self._lock:
+            key = (event.method, event.endpoint)
+            metrics = self.endpoints.get(key)
+            if metrics is None:
+                metrics = self.endpoints[key] = EndpointMetrics(event.method, event.endpoint)
+            metrics.observe(event)
+            if event.rate_limit_total is not None:
+                self.rate_limit_used = event.rate_limit_used
+                self.rate_limit_total = event.rate_limit_total
+
+    @property
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Requests left in the hourly quota as of the last response."""
+        if self.rate_limit_used is None or self.rate_limit_total is None:
+            return None
+        return self.rate_limit_total - self.rate_limit_used
+
+    def _sorted(self) -> List[EndpointMetrics]:
+        return sorted(self.endpoints.values(), key=lambda m: m.seconds_total, reverse=True)
+
+    def print_summary(self, stream: TextIO = sys.stderr):
+        """Print a per-endpoint table, slowest total first."""
+        print("\n" + "=" * 104, file=stream)
+        print("YNAB API REQUESTS", file=stream)
+        print("=" * 104, file=stream)
+        print(f"{'Endpoint':<62} {'Count':>6} {'Total (s)':>10} {'KiB':>10} {'Retries':>8}", file=stream)
+        print("-" * 104, file=stream)
+        for metrics in self._sorted():
+            name = f"{metrics.method} {metrics.endpoint}"
+            print(
+                f"{name:<62} {metrics.count:>6} {metrics.seconds_total:>10.3f} "
+                f"{metrics.response_bytes / 1024:>10,.1f} {metrics.retries:>8}",
+                file=stream
+            )
+        if self.rate_limit_remaining is not None:
+            print(f"\nRate limit remaining: {self.rate_limit_remaining}/{self.rate_limit_total}", file=stream)
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name: str, kind: str, description: str):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            endpoints = self._sorted()
+
+            header("ynab_requests_total", "counter", "YNAB API requests by endpoint and status code.")
+            for m in endpoints:
+                for status, count in sorted(m.status_codes.items()):
+                    lines.append(
+                        f'ynab_requests_total{{method="{m.method}",endpoint="{m.endpoint}",status="{status}"}} {count}'
+                    )
+
+            header("ynab_request_duration_seconds", "histogram", "YNAB API request latency, including retries.")
+            for m in endpoints:
+                labels = f'method="{m.method}",endpoint="{m.endpoint}"'
+                for bound, count in zip(LATENCY_BUCKETS, m.bucket_counts):
+                    lines.append(f'ynab_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'ynab_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.count}')
+                lines.append(f"ynab_request_duration_seconds_sum{{{labels}}} {m.seconds_total:.6f}")
+                lines.append(f"ynab_request_duration_seconds_count{{{labels}}} {m.count}")
+
+            header("ynab_response_bytes_total", "counter", "Bytes received from the YNAB API.")
+            for m in endpoints:
+                lines.append(f'ynab_response_bytes_total{{method="{m.method}",endpoint="{m.endpoint}"}} {m.response_bytes}')
+
+            header("ynab_request_retries_total", "counter", "Retried YNAB API requests.")
+            for m in endpoints:
+                lines.append(f'ynab_request_retries_total{{method="{m.method}",endpoint="{m.endpoint}"}} {m.retries}')
+
+            if self.rate_limit_total is not None:
+                header("ynab_rate_limit_remaining", "gauge", "Requests left in the current YNAB rate limit window.")
+                lines.append(f"ynab_rate_limit_remaining {self.rate_limit_remaining}")
+                header("ynab_rate_limit_total", "gauge", "Size of the YNAB rate limit window.")
+                lines.append(f"ynab_rate_limit_total {self.rate_limit_total}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Write the metrics for node_exporter's textfile collector.
+
+        The file is written next to its destination and renamed into place so
+        the collector never reads a partial file.
+        """
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ynab_metrics_", suffix=".prom")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
@@ -0,0 +1,149 @@
+"""Fuzzy matching strategies for Chase and YNAB transactions."""
+
+from decimal import Decimal
+from typing import List, Tuple
+
+from chase_parser import ChaseTransaction
+from ynab_client import YNABTransaction
+
+
+class TransactionMatcher:
+    """Match transactions between Chase and YNAB."""
+
+    def __init__(self, tolerance_days: int = 2, amount_tolerance: Decimal = Decimal("0.01")):
+        """
+        Initialize the matcher.
+
+        Args:
+            tolerance_days: Number of days to allow for date differences
+            amount_tolerance: Amount difference to tolerate (for floating point issues)
+        """
+        self.tolerance_days = tolerance_days
+        self.amount_tolerance = amount_tolerance
+
+    def find_match(
+        self,
+        chase_trans: ChaseTransaction,
+        ynab_transactions: List[YNABTransaction]
+    ) -> Tuple[bool, YNABTransaction | None]:
+        """
+        Find a matching YNAB transaction for a Chase transaction.
+
+        Args:
+            chase_trans: The Chase transaction to match
+            ynab_transactions: List of YNAB transactions to search
+
+        Returns:
+            Tuple of (found, matching_transaction)
+        """
+        for ynab_trans in ynab_transactions:
+            # Check if dates are within tolerance
+            date_diff = abs((chase_trans.date - ynab_trans.date).days)
+            if date_diff > self.tolerance_days:
+                continue
+
+            # Check if amounts match (YNAB uses negative for outflows)
+            # Chase might use negative for debits or positive for credits
+            amount_diff = abs(abs(chase_trans.amount) - abs(ynab_trans.amount))
+            if amount_diff > self.amount_tolerance:
+                continue
+
+            return True, ynab_trans
+
+        return False, None
+
+    def match_transactions(
+        self,
+        chase_transactions: List[ChaseTransaction],
+        ynab_transactions: List[YNABTransaction]
+    ) -> Tuple[List[Tuple[ChaseTransaction, YNABTransaction]], List[ChaseTransaction], List[YNABTransaction]]:
+        """
+        Match two lists of transactions.
+
+        Args:
+            chase_transactions: List of Chase transactions
+            ynab_transactions: List of YNAB transactions
+
+        Returns:
+            Tuple of (matches, unmatched_chase, unmatched_ynab)
+        """
+        matches = []
+        unmatched_chase = []
+        matched_ynab_ids = set()
+
+        # Find Chase transactions without matches in YNAB
+        for chase_trans in chase_transactions:
+            found, ynab_match = self.find_match(chase_trans, ynab_transactions)
+            if found and ynab_match:
+                matches.append((chase_trans, ynab_match))
+                matched_ynab_ids.add(ynab_match.transaction_id)
+            else:
+                unmatched_chase.append(chase_trans)
+
+        # Find YNAB transactions without matches in Chase
+        unmatched_ynab = [
+            trans for trans in ynab_transactions
+            if trans.transaction_id not in matched_ynab_ids
+        ]
+
+        return matches, unmatched_chase, unmatched_ynab
+
+    def compare_transactions(
+        self,
+        chase_transactions: List[ChaseTransaction],
+        ynab_transactions: List[YNABTransaction]
+    ) -> Tuple[List[ChaseTransaction], List[YNABTransaction]]:
+        """
+        Compare two lists of transactions.
+
+        Args:
+            chase_transactions: List of Chase transactions
+            ynab_transactions: List of YNAB transactions
+
+        Returns:
+            Tuple of (unmatched_chase, unmatched_ynab)
+        """
+        _, unmatched_chase, unmatched_ynab = self.match_transactions(chase_transactions, ynab_transactions)
+        return unmatched_chase, unmatched_ynab
+
+
+def window_match(
+    chase_transactions: List[ChaseTransaction],
+    ynab_transactions: List[YNABTransaction],
+    tolerance_days: int = 5
+) -> Tuple[List[Tuple[ChaseTransaction, YNABTransaction]], List[ChaseTransaction], List[YNABTransaction]]:
+    """
+    Match each Chase transaction to the first unused YNAB transaction with the
+    same signed amount and a date within +/- tolerance_days.
+
+    Args:
+        chase_transactions: List of Chase transactions
+        ynab_transactions: List of YNAB transactions
+        tolerance_days: Number of days to allow for date differences
+
+    Returns:
+        Tuple of (matches, unmatched_chase, unmatched_ynab)
+    """
+    matched_chase = set()
+    matched_ynab = set()
+    matches = []
+
+    for i, ct in enumerate(chase_transactions):
+        for j, yt in enumerate(ynab_transactions):
+            if j in matched_ynab:
+                continue
+
+            # Check if amounts match
+            if abs(float(ct.amount) - float(yt.amount)) < 0.01:
+                # Check if YNAB date is within the window around the Chase date
+                date_diff = (yt.date - ct.date).days
+                if -tolerance_days <= date_diff <= tolerance_days:
+                    matches.append((ct, yt))
+                    matched_chase.add(i)
+                    matched_ynab.add(j)
+                    break
+
+    unmatched_chase = [t for i, t in enumerate(chase_transactions) if i not in matched_chase]
+    unmatched_ynab = [t for j, t in enumerate(ynab_transactions) if j not in matched_ynab]
+
+    return matches, unmatched_chase, unmatched_ynab
@@ -0,0 +1,197 @@
+"""Machine-readable (JSON Lines, CSV, JSON) output for comparison results."""
+
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from chase_parser import ChaseTransaction
+from ynab_client import YNABTransaction
+
+
+FORMATS = ["json", "jsonl", "csv"]
+
+# Column order for CSV output; every record is flattened onto these columns
+CSV_FIELDS = [
+    "record",
+    "strategy",
+    "chase_date",
+    "chase_amount",
+    "chase_description",
+    "ynab_id",
+    "ynab_date",
+    "ynab_amount",
+    "ynab_payee",
+    "ynab_memo",
+    "ynab_cleared",
+    "chase_balance",
+    "ynab_balance",
+    "difference",
+    "stage",
+    "seconds",
+]
+
+BUFFER_SIZE = 1 << 16
+
+
+def date_ordered(transactions: List) -> List:
+    """
+    Transactions oldest first; rows on the same date keep their input order.
+
+    Chase exports are newest first and YNAB responses oldest first. The sort
+    is stable, and Timsort handles input that is already ordered either way
+    in linear time, so no separate fast path is needed.
+    """
+    return sorted(transactions, key=lambda t: t.date)
+
+
+def _chase_fields(trans: ChaseTransaction) -> Dict:
+    return {
+        "chase_date": trans.date.strftime('%Y-%m-%d'),
+        "chase_amount": float(trans.amount),
+        "chase_description": trans.description,
+    }
+
+
+def _ynab_fields(trans: YNABTransaction) -> Dict:
+    return {
+        "ynab_id": trans.transaction_id,
+        "ynab_date": trans.date.strftime('%Y-%m-%d'),
+        "ynab_amount": float(trans.amount),
+        "ynab_payee": trans.payee_name,
+        "ynab_memo": trans.memo,
+        "ynab_cleared": trans.cleared,
+    }
+
+
+class ResultWriter(ABC):
+    """Stream result records to a file or stdout."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path:
+            self.stream = open(path, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE)
+            self._owns_stream = True
+        else:
+            self.stream = sys.stdout
+            self._owns_stream = False
+
+    @abstractmethod
+    def write_record(self, record: Dict):
+        """Write a single record."""
+
+    def close(self):
+        """Flush output and close the file if we opened it."""
+        self.stream.flush()
+        if self._owns_stream:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JSONLinesWriter(ResultWriter):
+    """One JSON object per line."""
+
+    def write_record(self, record: Dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self.stream.write("\n")
+
+
+class JSONWriter(ResultWriter):
+    """A single JSON array, written incrementally."""
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        self._count = 0
+        self.stream.write("[")
+
+    def write_record(self, record: Dict):
+        self.stream.write(",\n" if self._count else "\n")
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self._count += 1
+
+    def close(self):
+        self.stream.write("\n]\n")
+        super().close()
+
+
+class CSVWriter(ResultWriter):
+    """CSV with one row per record and a fixed set of columns."""
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(path)
+        self._writer = csv.DictWriter(self.stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write_record(self, record: Dict):
+        self._writer.writerow(record)
+
+
+WRITERS = {
+    "json": JSONWriter,
+    "jsonl": JSONLinesWriter,
+    "csv": CSVWriter,
+}
+
+
+def open_writer(output_format: str, path: Optional[str] = None) -> ResultWriter:
+    """Create a writer for the given format ("json", "jsonl" or "csv")."""
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}'")
+    return WRITERS[output_format](path)
+
+
+def result_records(session, result) -> Iterable[Dict]:
+    """
+    Yield balance, matched and unmatched records for one strategy.
+
+    Args:
+        session: The ReconciliationSession (or Reconciliation) the result came from
+        result: MatchResult to convert
+    """
+    yield {
+        "record": "balance",
+        "strategy": result.strategy,
+        "chase_balance": float(session.chase_balance),
+        "ynab_balance": float(session.ynab_balance),
+        "difference": float(session.chase_balance - session.ynab_balance),
+    }
+
+    for chase_trans, ynab_trans in result.matches:
+        record = {"record": "matched", "strategy": result.strategy}
+        record.update(_chase_fields(chase_trans))
+        record.update(_ynab_fields(ynab_trans))
+        yield record
+
+    for trans in date_ordered(result.unmatched_chase):
+        record = {"record": "unmatched_chase", "strategy": result.strategy}
+        record.update(_chase_fields(trans))
+        yield record
+
+    for trans in date_ordered(result.unmatched_ynab):
+        record = {"record": "unmatched_ynab", "strategy": result.strategy}
+        record.update(_ynab_fields(trans))
+        yield record
+
+
+def write_result(writer: ResultWriter, session, result):
+    """
+    Write balance, matched and unmatched records for one strategy.
+
+    Args:
+        writer: Destination writer
+        session: The ReconciliationSession the result came from
+        result: MatchResult to write
+    """
+    for record in result_records(session, result):
+        writer.write_record(record)
+
+
+def write_timings(writer: ResultWriter, timings: Dict[str, float]):
+    """Write one record per timed pipeline stage."""
+    for stage, seconds in timings.items():
+        writer.write_record({"record": "timing", "stage": stage, "seconds": round(seconds, 6)})
@@ -0,0 +1,123 @@
+"""Month-sharded fuzzy matching across CPU cores.
+
+TransactionMatcher pairs each Chase row with the first YNAB row (in list
+order) within tolerance_days and the amount tolerance, and never uses a
+YNAB row up. So a month of Chase rows only needs the YNAB rows dated within
+that month +/- tolerance_days, kept in their original order, to find
+exactly the match a serial run would. The shards are matched in a process
+pool and merged back by position, so the output is identical to
+TransactionMatcher.match_transactions().
+"""
+
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from chase_parser import ChaseTransaction
+from matcher import TransactionMatcher
+from ynab_client import YNABTransaction
+
+
+def shard_by_month(transactions: List[ChaseTransaction]) -> Dict[Tuple[int, int], List[int]]:
+    """Positions of the transactions in each (year, month), in list order."""
+    shards: Dict[Tuple[int, int], List[int]] = {}
+    for i, trans in enumerate(transactions):
+        shards.setdefault((trans.date.year, trans.date.month), []).append(i)
+    return shards
+
+
+def _match_shard(
+    chase_shard: List[ChaseTransaction],
+    ynab_shard: List[YNABTransaction],
+    tolerance_days: int,
+    amount_tolerance: Decimal
+) -> List[Optional[int]]:
+    """Position in ynab_shard of each Chase row's match, or None."""
+    matcher = TransactionMatcher(tolerance_days=tolerance_days, amount_tolerance=amount_tolerance)
+    positions = {id(trans): j for j, trans in enumerate(ynab_shard)}
+    result = []
+    for chase_trans in chase_shard:
+        found, ynab_match = matcher.find_match(chase_trans, ynab_shard)
+        result.append(positions[id(ynab_match)] if found and ynab_match else None)
+    return result
+
+
+def parallel_match_transactions(
+    chase_transactions: List[ChaseTransaction],
+    ynab_transactions: List[YNABTransaction],
+    tolerance_days: int = 2,
+    amount_tolerance: Decimal = Decimal("0.01"),
+    jobs: Optional[int] = None
+) -> Tuple[List[Tuple[ChaseTransaction, YNABTransaction]], List[ChaseTransaction], List[YNABTransaction]]:
+    """
+    Match two lists of transactions month by month, in parallel.
+
+    Args:
+        chase_transactions: List of Chase transactions
+        ynab_transactions: List of YNAB transactions
+        tolerance_days: Number of days to allow for date differences
+        amount_tolerance: Amount difference to tolerate
+        jobs: Worker processes (None or 0 for every CPU core); 1 matches the shards in this process
+
+    Returns:
+        Tuple of (matches, unmatched_chase, unmatched_ynab), identical to
+        TransactionMatcher.match_transactions()
+    """
+    jobs = jobs or os.cpu_count() or 1
+    margin = timedelta(days=tolerance_days)
+
+    # YNAB positions sorted by date, to cut each month's window out with bisect
+    by_date = sorted(range(len(ynab_transactions)), key=lambda j: ynab_transactions[j].date)
+    dates = [ynab_transactions[j].date for j in by_date]
+
+    shards = []
+    for chase_positions in shard_by_month(chase_transactions).values():
+        shard_dates = [chase_transactions[i].date for i in chase_positions]
+        lo = bisect_left(dates, min(shard_dates) - margin)
+        hi = bisect_right(dates, max(shard_dates) + margin)
+        # Restore list order so find_match sees candidates in the same order as a serial run
+        ynab_positions = sorted(by_date[lo:hi])
+        shards.append((chase_positions, ynab_positions))
+
+    tasks = [
+        (
+            [chase_transactions[i] for i in chase_positions],
+            [ynab_transactions[j] for j in ynab_positions],
+            tolerance_days,
+            amount_tolerance,
+        )
+        for chase_positions, ynab_positions in shards
+    ]
+
+    if jobs == 1 or len(tasks) < 2:
+        results = [_match_shard(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            results = list(pool.map(_match_shard, *zip(*tasks)))
+
+    # Merge by original position
+    match_of: List[Optional[int]] = [None] * len(chase_transactions)
+    for (chase_positions, ynab_positions), shard_result in zip(shards, results):
+        for i, j in zip(chase_positions, shard_result):
+            if j is not None:
+                match_of[i] = ynab_positions[j]
+
+    matches = []
+    unmatched_chase = []
+    matched_ynab_ids = set()
+    for chase_trans, j in zip(chase_transactions, match_of):
+        if j is None:
+            unmatched_chase.append(chase_trans)
+        else:
+            matches.append((chase_trans, ynab_transactions[j]))
+            matched_ynab_ids.add(ynab_transactions[j].transaction_id)
+
+    unmatched_ynab = [
+        trans for trans in ynab_transactions
+        if trans.transaction_id not in matched_ynab_ids
+    ]
+
+    return matches, unmatched_chase, unmatched_ynab
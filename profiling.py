@@ -0,0 +1,156 @@
+"""Per-stage timing and memory profiling for the reconciliation pipeline."""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, TextIO
+
+
+class StageStats:
+    """Accumulated measurements for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "stage": self.name,
+            "calls": self.calls,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_kib": round(self.peak_bytes / 1024, 1),
+        }
+
+
+class StageProfiler:
+    """
+    Record wall time, CPU time, call counts and memory peaks per stage.
+
+    Stages may be nested; each keeps its own totals. Memory is only traced
+    when trace_memory is set, since tracemalloc slows Python down noticeably.
+    Stages may also run in several threads at once; their CPU times and
+    memory peaks then overlap, since both are measured for the whole process.
+    """
+
+    def __init__(self, trace_memory: bool = False, cprofile_path: Optional[str] = None):
+        """
+        Args:
+            trace_memory: Record tracemalloc peaks for each stage
+            cprofile_path: If set, run cProfile between start() and stop() and dump stats here
+        """
+        self.trace_memory = trace_memory
+        self.cprofile_path = cprofile_path
+        self.stages: Dict[str, StageStats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cprofile = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Begin memory tracing and cProfile collection, if enabled."""
+        if self.trace_memory:
+            # tracemalloc pulls in pickle and linecache, so only load it when tracing
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        if self.cprofile_path:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        """Stop collection and write the cProfile dump."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+            self._cprofile = None
+        if self._started_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @property
+    def _peak_stack(self) -> List[int]:
+        """Memory peaks of the enclosing stages running in this thread."""
+        stack = getattr(self._local, "peak_stack", None)
+        if stack is None:
+            stack = self._local.peak_stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as the named stage."""
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name)
+
+        if self.trace_memory:
+            import tracemalloc
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stage's peak before resetting it for this one
+            if self._peak_stack:
+                self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+            tracemalloc.reset_peak()
+            self._peak_stack.append(current)
+            start_bytes = current
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stats
+        finally:
+            wall_seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            with self._lock:
+                stats.calls += 1
+                stats.wall_seconds += wall_seconds
+                stats.cpu_seconds += cpu_seconds
+
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self._peak_stack.pop())
+                stats.peak_bytes = max(stats.peak_bytes, peak - start_bytes)
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Wall time per stage, in seconds."""
+        return {name: stats.wall_seconds for name, stats in self.stages.items()}
+
+    def summary(self) -> List[Dict]:
+        """Per-stage measurements as a list of dicts, in the order stages first ran."""
+        return [stats.to_dict() for stats in self.stages.values()]
+
+    def print_summary(self, stream: TextIO = sys.stderr):
+        """Print a per-stage table."""
+        print("\n" + "=" * 80, file=stream)
+        print("PROFILE", file=stream)
+        print("=" * 80, file=stream)
+        print(f"{'Stage':<28} {'Calls':>6} {'Wall (s)':>10} {'CPU (s)':>10} {'Peak KiB':>12}", file=stream)
+        print("-" * 80, file=stream)
+        for stats in self.stages.values():
+            peak = f"{stats.peak_bytes / 1024:>12,.1f}" if self.trace_memory else f"{'-':>12}"
+            print(
+                f"{stats.name:<28} {stats.calls:>6} {stats.wall_seconds:>10.3f} {stats.cpu_seconds:>10.3f} {peak}",
+                file=stream
+            )
+
+    def write_json(self, path: str):
+        """Write the per-stage summary to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"stages": self.summary()}, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,93 @@
+"""Track how far each YNAB account has been reconciled.
+
+Everything on or before an account's reconciled point is locked in YNAB,
+so later runs only need to fetch and compare transactions after it. The
+point is learned from the API data (the reconciled transactions it returns)
+and kept in a small local JSON file between runs.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ynab_client import YNABTransaction
+
+DEFAULT_PATH = ".reconcile_state.json"
+
+
+def reconciled_through(transactions: List[YNABTransaction]) -> Optional[datetime]:
+    """
+    Latest date up to which every transaction is reconciled.
+
+    Reconciled transactions dated after an older unreconciled one (e.g. an
+    uncleared check) don't move the point past that unreconciled one.
+
+    Returns:
+        The date, or None if nothing is reconciled before the first open transaction
+    """
+    first_open = min((t.date for t in transactions if t.cleared != "reconciled"), default=None)
+    reconciled = [
+        t.date for t in transactions
+        if t.cleared == "reconciled" and (first_open is None or t.date < first_open)
+    ]
+    return max(reconciled, default=None)
+
+
+class ReconcileState:
+    """Per-account reconciled points, stored as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: State file (default: RECONCILE_STATE in the environment, or .reconcile_state.json)
+        """
+        self.path = path or os.getenv("RECONCILE_STATE") or DEFAULT_PATH
+        self.accounts: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.accounts = json.load(f).get("accounts", {})
+
+    @staticmethod
+    def _key(budget_name: str, account_name: str) -> str:
+        return f"{budget_name.lower()}/{account_name.lower()}"
+
+    def get(self, budget_name: str, account_name: str) -> Optional[datetime]:
+        """Reconciled point for an account, if known."""
+        entry = self.accounts.get(self._key(budget_name, account_name))
+        if not entry:
+            return None
+        return datetime.strptime(entry["reconciled_through"], "%Y-%m-%d")
+
+    def since_date(self, budget_name: str, account_name: str) -> Optional[str]:
+        """First date after the reconciled point, in YYYY-MM-DD format, for since_date fetches."""
+        point = self.get(budget_name, account_name)
+        return (point + timedelta(days=1)).strftime('%Y-%m-%d') if point else None
+
+    def update(self, budget_name: str, account_name: str, transactions: List[YNABTransaction]) -> Optional[datetime]:
+        """
+        Move the account's point forward using freshly fetched transactions.
+
+        The point never moves backwards, since a fetch that starts after it
+        can't see what is before it.
+
+        Returns:
+            The account's reconciled point after the update
+        """
+        current = self.get(budget_name, account_name)
+        latest = reconciled_through(transactions)
+        if latest is None or (current is not None and latest <= current):
+            return current
+
+        self.accounts[self._key(budget_name, account_name)] = {
+            "budget": budget_name,
+            "account": account_name,
+            "reconciled_through": latest.strftime('%Y-%m-%d'),
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        return latest
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"accounts": self.accounts}, f, indent=2, sort_keys=True)
+            f.write("\n")
@@ -0,0 +1,149 @@
+"""Text reports for comparison results."""
+
+from decimal import Decimal
+from typing import List
+
+from chase_parser import ChaseTransaction
+from output_formats import date_ordered
+from ynab_client import YNABTransaction
+
+
+def print_results(
+    chase_balance: Decimal,
+    ynab_balance: Decimal,
+    unmatched_chase: List[ChaseTransaction],
+    unmatched_ynab: List[YNABTransaction]
+):
+    """Print comparison results."""
+    print("\n" + "=" * 80)
+    print("BALANCE COMPARISON")
+    print("=" * 80)
+    print(f"Chase Balance:       ${chase_balance:,.2f}")
+    print(f"YNAB Balance:        ${ynab_balance:,.2f}")
+    print(f"Difference:          ${chase_balance - ynab_balance:,.2f}")
+
+    if unmatched_chase:
+        print("\n" + "=" * 80)
+        print(f"TRANSACTIONS IN CHASE BUT NOT IN YNAB ({len(unmatched_chase)})")
+        print("=" * 80)
+        for trans in date_ordered(unmatched_chase):
+            print(f"{trans.date.strftime('%Y-%m-%d')} | ${trans.amount:>10.2f} | {trans.description}")
+
+    if unmatched_ynab:
+        print("\n" + "=" * 80)
+        print(f"TRANSACTIONS IN YNAB BUT NOT IN CHASE ({len(unmatched_ynab)})")
+        print("=" * 80)
+        for trans in date_ordered(unmatched_ynab):
+            memo = f" ({trans.memo})" if trans.memo else ""
+            print(f"{trans.date.strftime('%Y-%m-%d')} | ${trans.amount:>10.2f} | {trans.payee_name}{memo}")
+
+    if not unmatched_chase and not unmatched_ynab:
+        print("\n" + "=" * 80)
+        print("All transactions matched!")
+        print("=" * 80)
+
+
+def print_summary(session, result):
+    """Print the balance comparison and unmatched transactions."""
+    print_results(session.chase_balance, session.ynab_balance, result.unmatched_chase, result.unmatched_ynab)
+
+
+def ynab_label(session, *qualifiers: str) -> str:
+    """Label for the session's YNAB transactions, e.g. "YNAB (unreconciled, in range)"."""
+    if session.unreconciled_only:
+        qualifiers = ("unreconciled",) + qualifiers
+    return f"YNAB ({', '.join(qualifiers)})" if qualifiers else "YNAB"
+
+
+def print_side_by_side(session, result):
+    """Print unmatched Chase and YNAB transactions in two columns."""
+    earliest_date, latest_date = session.date_range
+
+    print("=" * 120)
+    print(f"RECONCILIATION COMPARISON: {earliest_date.strftime('%Y-%m-%d')} to {latest_date.strftime('%Y-%m-%d')}")
+    print("=" * 120)
+    print(f"Chase CSV: {len(session.chase_transactions)} transactions")
+    print(f"{ynab_label(session)}: {len(session.ynab_transactions)} transactions")
+    print()
+    print(f"Matching logic: YNAB date can be within ±{result.tolerance_days} days of Chase date")
+    print("               Amount must match exactly")
+    print()
+
+    print("=" * 120)
+    print("TRANSACTIONS THAT DON'T MATCH")
+    print("=" * 120)
+    print(f"{'IN CHASE, NOT IN YNAB':<55} | {'IN YNAB, NOT IN CHASE':<55}")
+    print("-" * 120)
+
+    # Print side by side
+    max_len = max(len(result.unmatched_chase), len(result.unmatched_ynab))
+    for i in range(max_len):
+        chase_str = ""
+        ynab_str = ""
+
+        if i < len(result.unmatched_chase):
+            ct = result.unmatched_chase[i]
+            chase_str = f"{ct.date} ${ct.amount:>10.2f} {ct.description[:28]}"
+
+        if i < len(result.unmatched_ynab):
+            yt = result.unmatched_ynab[i]
+            ynab_str = f"{yt.date} ${yt.amount:>10.2f} {yt.payee_name[:28]}"
+
+        print(f"{chase_str:<55} | {ynab_str:<55}")
+
+    print()
+    print("=" * 120)
+    print("SUMMARY")
+    print("=" * 120)
+    print(f"Matched: {len(result.matches)} transactions")
+    print(f"In Chase, not in YNAB: {len(result.unmatched_chase)} transactions (ADD to YNAB)")
+    print(f"In YNAB, not in Chase: {len(result.unmatched_ynab)} transactions (INVESTIGATE)")
+    print()
+
+    # Calculate totals
+    chase_total = sum(float(t.amount) for t in result.unmatched_chase)
+    ynab_total = sum(float(t.amount) for t in result.unmatched_ynab)
+
+    print(f"Unmatched Chase total: ${chase_total:,.2f}")
+    print(f"Unmatched YNAB total: ${ynab_total:,.2f}")
+    print(f"Net difference: ${chase_total - ynab_total:,.2f}")
+
+
+def print_simple(session, result):
+    """Print a plain list of what is only in Chase and only in YNAB."""
+    earliest_date, latest_date = session.date_range
+
+    print("=" * 80)
+    print(f"CSV DATE RANGE: {earliest_date.strftime('%Y-%m-%d')} to {latest_date.strftime('%Y-%m-%d')}")
+    print("=" * 80)
+    print(f"Chase CSV: {len(session.chase_transactions)} transactions")
+    print(f"{ynab_label(session, 'in range')}: {len(session.ynab_transactions)} transactions")
+    print()
+
+    print("=" * 80)
+    print(f"IN CHASE CSV BUT NOT IN YNAB: {len(result.unmatched_chase)}")
+    print("=" * 80)
+    for trans in sorted(result.unmatched_chase, key=lambda t: (t.date, t.amount)):
+        print(f"{trans.date} | ${trans.amount:>10.2f} | {trans.description[:70]}")
+
+    print()
+    print("=" * 80)
+    print(f"IN YNAB BUT NOT IN CHASE CSV: {len(result.unmatched_ynab)}")
+    print("=" * 80)
+    for trans in sorted(result.unmatched_ynab, key=lambda t: (t.date, t.amount)):
+        print(f"{trans.date} | ${trans.amount:>10.2f} | {trans.payee_name}")
+
+    print()
+    print("=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Transactions to ADD to YNAB: {len(result.unmatched_chase)}")
+    print(f"Transactions to INVESTIGATE in YNAB: {len(result.unmatched_ynab)}")
+
+
+# Report name -> renderer taking (session, result)
+REPORTS = {
+    "summary": print_summary,
+    "side-by-side": print_side_by_side,
+    "simple": print_simple,
+}
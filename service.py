@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Local HTTP service that answers reconciliation queries from warm caches.
+
+One process holds a pooled YNABClient, a ReconciliationSession per
+(budget, account) with its resolved IDs and delta-synced YNAB transactions,
+and every parsed export, so repeated queries skip interpreter startup,
+parsing, name resolution and full fetches.
+
+    python service.py --data-dir data --port 8780
+    curl 'http://127.0.0.1:8780/reconcile?export=chase-transactions.csv'
+
+Endpoints (all GET):
+    /reconcile  Query parameters: export (file name in the data directory,
+                default: newest CSV), budget, account, strategy,
+                tolerance_days, date_from, date_to, details=1 to include
+                every matched and unmatched record
+    /metrics    YNAB API request metrics in Prometheus text format
+    /health     Liveness check
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from chase_parser import find_exports
+from http_metrics import HTTPMetrics
+from output_formats import result_records
+from session import ReconciliationSession, STRATEGY_TOLERANCE_DAYS, reconcile
+from ynab_client import YNABClient
+
+
+class ReconciliationService:
+    """Warm state shared by every request."""
+
+    def __init__(
+        self,
+        ynab_token: str,
+        data_dir: str,
+        budget_name: Optional[str] = None,
+        account_name: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_retries: int = 3
+    ):
+        """
+        Args:
+            ynab_token: YNAB Personal Access Token
+            data_dir: Directory holding the Chase exports that may be queried
+            budget_name: Budget to use when a query doesn't name one
+            account_name: Account to use when a query doesn't name one
+            base_url: Optional YNAB API root (e.g. a local stand-in server)
+            max_retries: Number of times to retry 429 and 5xx responses
+        """
+        self.ynab_token = ynab_token
+        self.data_dir = os.path.abspath(data_dir)
+        self.budget_name = budget_name
+        self.account_name = account_name
+        self.metrics = HTTPMetrics()
+        self.client = YNABClient(ynab_token, on_request=self.metrics, max_retries=max_retries, base_url=base_url)
+        self.sessions: Dict[Tuple[str, str], Tuple[ReconciliationSession, threading.Lock]] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, budget_name: str, account_name: str) -> Tuple[ReconciliationSession, threading.Lock]:
+        """Get (or create) the warm session for an account and the lock that serializes its use."""
+        key = (budget_name.lower(), account_name.lower())
+        with self._lock:
+            if key not in self.sessions:
+                session = ReconciliationSession(
+                    None,
+                    self.ynab_token,
+                    budget_name,
+                    account_name,
+                    client=self.client
+                )
+                self.sessions[key] = (session, threading.Lock())
+            return self.sessions[key]
+
+    def export_path(self, name: Optional[str]) -> str:
+        """Resolve an export name inside the data directory (default: the newest CSV)."""
+        if not name:
+            exports = find_exports(self.data_dir)
+            if not exports:
+                raise FileNotFoundError(f"No CSV exports in {self.data_dir}")
+            return max(exports, key=os.path.getmtime)
+
+        path = os.path.abspath(os.path.join(self.data_dir, name))
+        if os.path.dirname(path) != self.data_dir:
+            raise ValueError("export must be a file name in the data directory")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Export '{name}' not found")
+        return path
+
+    def reconcile(self, params: Dict[str, str]) -> Dict:
+        """Run one reconciliation query and return the JSON response body."""
+        budget_name = params.get("budget") or self.budget_name
+        account_name = params.get("account") or self.account_name
+        if not budget_name or not account_name:
+            raise ValueError("budget and account are required")
+
+        strategy = params.get("strategy", "fuzzy")
+        if strategy not in STRATEGY_TOLERANCE_DAYS:
+            raise ValueError(f"Unknown matching strategy '{strategy}'")
+        tolerance_days = int(params["tolerance_days"]) if params.get("tolerance_days") else None
+        date_from = datetime.strptime(params["date_from"], "%Y-%m-%d") if params.get("date_from") else None
+        date_to = datetime.strptime(params["date_to"], "%Y-%m-%d") if params.get("date_to") else None
+
+        path = self.export_path(params.get("export"))
+        session, lock = self.session_for(budget_name, account_name)
+
+        start = time.perf_counter()
+        with lock:
+            reconciliation = reconcile(
+                path,
+                self.ynab_token,
+                budget_name,
+                account_name,
+                strategy=strategy,
+                tolerance_days=tolerance_days,
+                date_from=date_from,
+                date_to=date_to,
+                session=session
+            )
+
+        body = reconciliation.summary()
+        body["export"] = os.path.basename(path)
+        body["seconds"] = round(time.perf_counter() - start, 6)
+        if params.get("details") in ("1", "true"):
+            body["records"] = list(result_records(reconciliation, reconciliation.result))
+        return body
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the shared ReconciliationService."""
+
+    service: ReconciliationService = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, data: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, body: Dict):
+        self._send(status, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/health":
+            return self._send_json(200, {"status": "ok"})
+        if url.path == "/metrics":
+            return self._send(200, self.service.metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        if url.path != "/reconcile":
+            return self._send_json(404, {"error": "Not found"})
+
+        try:
+            self._send_json(200, self.service.reconcile(params))
+        except FileNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            # Most likely the YNAB API failing after retries
+            self._send_json(502, {"error": str(e)})
+
+
+def make_server(service: ReconciliationService, host: str = "127.0.0.1", port: int = 8780) -> ThreadingHTTPServer:
+    """Create a server for the given service; port 0 picks a free port."""
+    handler = type("BoundServiceRequestHandler", (ServiceRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Main CLI entry point."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Serve reconciliation status over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8780, help="Port to listen on (default: 8780)")
+    parser.add_argument("--data-dir", default="data", help="Directory holding the Chase exports (default: data)")
+    parser.add_argument(
+        "--ynab-token",
+        default=os.getenv("YNAB_TOKEN"),
+        help="YNAB Personal Access Token (or set YNAB_TOKEN in .env)"
+    )
+    parser.add_argument(
+        "--budget-name",
+        default=os.getenv("BUDGET_NAME"),
+        help="Default YNAB budget for queries that don't name one (or set BUDGET_NAME in .env)"
+    )
+    parser.add_argument(
+        "--account-name",
+        default=os.getenv("ACCOUNT_NAME"),
+        help="Default YNAB account for queries that don't name one (or set ACCOUNT_NAME in .env)"
+    )
+    parser.add_argument(
+        "--ynab-base-url",
+        default=os.getenv("YNAB_BASE_URL"),
+        help="YNAB API root, e.g. a local stand-in server (or set YNAB_BASE_URL in .env)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retry rate-limited (429) and server error responses this many times (default: 3)"
+    )
+    args = parser.parse_args()
+
+    if not args.ynab_token:
+        print("Error: --ynab-token argument is required (or set YNAB_TOKEN in .env)", file=sys.stderr)
+        sys.exit(1)
+
+    service = ReconciliationService(
+        args.ynab_token,
+        args.data_dir,
+        budget_name=args.budget_name,
+        account_name=args.account_name,
+        base_url=args.ynab_base_url,
+        max_retries=args.max_retries
+    )
+    server = make_server(service, args.host, args.port)
+    print(f"Serving reconciliation status at http://{args.host}:{server.server_address[1]}/reconcile (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
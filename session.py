@@ -0,0 +1,648 @@
+"""Load a Chase export and a YNAB account once, then compare them in several ways."""
+
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from chase_parser import parse_chase_csv, quick_date_range, ChaseTransaction
+from exact_match import exact_match
+from matcher import TransactionMatcher, window_match
+from profiling import StageProfiler
+from reconcile_state import ReconcileState
+from transfers import exclude_transfers
+from ynab_client import RequestEvent, YNABClient, YNABTransaction
+
+if TYPE_CHECKING:
+    # Only --store runs need sqlite3, and they create the store themselves
+    from history_store import HistoryStore
+
+
+# Default date tolerance for each matching strategy
+STRATEGY_TOLERANCE_DAYS = {
+    "fuzzy": 2,
+    "exact": 0,
+    "window": 5,
+}
+
+
+class MatchResult:
+    """Outcome of running one matching strategy."""
+
+    def __init__(
+        self,
+        strategy: str,
+        tolerance_days: int,
+        matches: List[Tuple[ChaseTransaction, YNABTransaction]],
+        unmatched_chase: List[ChaseTransaction],
+        unmatched_ynab: List[YNABTransaction],
+        transfer_pairs: Optional[List[Tuple[YNABTransaction, YNABTransaction]]] = None
+    ):
+        self.strategy = strategy
+        self.tolerance_days = tolerance_days
+        self.matches = matches
+        self.unmatched_chase = unmatched_chase
+        self.unmatched_ynab = unmatched_ynab
+        self.transfer_pairs = transfer_pairs or []
+
+    def __repr__(self):
+        return (
+            f"MatchResult(strategy='{self.strategy}', matched={len(self.matches)}, "
+            f"unmatched_chase={len(self.unmatched_chase)}, unmatched_ynab={len(self.unmatched_ynab)})"
+        )
+
+
+class ReconciliationSession:
+    """Holds one Chase export and the matching YNAB data in memory."""
+
+    def __init__(
+        self,
+        chase_path: str,
+        ynab_token: str,
+        budget_name: str,
+        account_name: str,
+        profiler: Optional[StageProfiler] = None,
+        on_request: Optional[Callable[[RequestEvent], None]] = None,
+        max_retries: int = 0,
+        base_url: Optional[str] = None,
+        client: Optional[YNABClient] = None,
+        jobs: Optional[int] = None
+    ):
+        """
+        Args:
+            chase_path: Path to the Chase CSV export
+            ynab_token: YNAB Personal Access Token
+            budget_name: Name of the YNAB budget
+            account_name: Name of the YNAB account to compare
+            profiler: Optional StageProfiler to record per-stage timings and memory
+            on_request: Optional YNABClient callback receiving a RequestEvent per HTTP request
+            max_retries: Number of times the YNABClient retries 429 and 5xx responses
+            base_url: Optional YNAB API root (e.g. a local stand-in server)
+            client: Optional existing YNABClient to share (on_request, max_retries
+                and base_url are then ignored)
+            jobs: If set, run the fuzzy strategy month by month in this many
+                processes (0 for every CPU core) instead of the serial matcher
+        """
+        self.chase_path = chase_path
+        self.ynab_token = ynab_token
+        self.budget_name = budget_name
+        self.account_name = account_name
+
+        self.client: Optional[YNABClient] = client
+        self.budget_id: Optional[str] = None
+        self.account_id: Optional[str] = None
+        self.since_date: Optional[str] = None
+        # Unmatched YNAB rows dated before this were only fetched as match candidates
+        self.report_from: Optional[datetime] = None
+        self.chase_transactions: List[ChaseTransaction] = []
+        self.ynab_transactions: List[YNABTransaction] = []
+        self.budget_transactions: List[YNABTransaction] = []
+        self.ynab_balance = Decimal("0")
+        self.server_knowledge: Optional[int] = None
+        self._ynab_cache: Dict[str, YNABTransaction] = {}
+        self.pair_transfers = False
+        self.unreconciled_only = False
+        self.profiler = profiler or StageProfiler()
+        self.on_request = on_request
+        self.max_retries = max_retries
+        self.base_url = base_url
+        self.jobs = jobs
+        self._results: Dict[Tuple[str, int], MatchResult] = {}
+        self._parsed: Dict[str, Tuple[float, List[ChaseTransaction]]] = {}
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Wall time spent in each pipeline stage, in seconds."""
+        return self.profiler.timings
+
+    def load_chase(self) -> List[ChaseTransaction]:
+        """
+        Parse the Chase CSV export.
+
+        Parsed exports are kept per path, so loading the same unchanged file
+        again in this session skips the parse.
+        """
+        mtime = os.path.getmtime(self.chase_path)
+        cached = self._parsed.get(self.chase_path)
+        if cached and cached[0] == mtime:
+            self.chase_transactions = list(cached[1])
+        else:
+            with self.profiler.stage("parse_chase"):
+                self.chase_transactions = parse_chase_csv(self.chase_path)
+            self._parsed[self.chase_path] = (mtime, list(self.chase_transactions))
+        self._results.clear()
+        if not self.chase_transactions:
+            raise ValueError("No transactions found in Chase CSV")
+        return self.chase_transactions
+
+    def connect(self) -> YNABClient:
+        """Create the YNAB client and resolve the budget and account IDs, once per session."""
+        if self.client is None:
+            self.client = YNABClient(
+                self.ynab_token,
+                on_request=self.on_request,
+                max_retries=self.max_retries,
+                base_url=self.base_url
+            )
+
+        if self.budget_id is None:
+            with self.profiler.stage("ynab_budgets"):
+                self.budget_id = self.client.get_budget_id(self.budget_name)
+            if not self.budget_id:
+                raise ValueError(f"Budget '{self.budget_name}' not found")
+
+        if self.account_id is None:
+            with self.profiler.stage("ynab_accounts"):
+                self.account_id = self.client.get_account_id(self.budget_id, self.account_name)
+            if not self.account_id:
+                raise ValueError(f"Account '{self.account_name}' not found")
+
+        return self.client
+
+    def load_ynab(
+        self,
+        since_date: Optional[str] = None,
+        pair_transfers: bool = False,
+        concurrent: bool = False
+    ) -> List[YNABTransaction]:
+        """
+        Resolve the budget and account and fetch their transactions.
+
+        Args:
+            since_date: Optional date in YYYY-MM-DD format (defaults to the earliest Chase date)
+            pair_transfers: Also fetch every account's transactions to pair transfers against
+            concurrent: Send the transactions, balance and budget requests in parallel threads
+
+        Returns:
+            List of YNABTransaction objects for the account
+        """
+        if since_date is None and self.chase_transactions:
+            since_date = self.date_range[0].strftime('%Y-%m-%d')
+        self.since_date = since_date
+        self.report_from = None
+
+        def fetch_transactions():
+            with self.profiler.stage("ynab_transactions"):
+                return self.client.get_transactions(self.budget_id, self.account_id, since_date=since_date)
+
+        def fetch_balance():
+            with self.profiler.stage("ynab_balance"):
+                return self.client.get_account_balance(self.budget_id, self.account_id)
+
+        def fetch_budget_transactions():
+            with self.profiler.stage("ynab_budget_transactions"):
+                return self.client.get_budget_transactions(self.budget_id, since_date=since_date)
+
+        fetches = [fetch_transactions, fetch_balance]
+        if pair_transfers:
+            fetches.append(fetch_budget_transactions)
+
+        with self.profiler.stage("fetch_ynab"):
+            self.connect()
+
+            # The requests are independent once the IDs are known
+            if concurrent:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=len(fetches)) as pool:
+                    results = [future.result() for future in [pool.submit(fetch) for fetch in fetches]]
+            else:
+                results = [fetch() for fetch in fetches]
+
+        self.ynab_transactions, self.ynab_balance = results[0], results[1]
+        self.pair_transfers = pair_transfers
+        if pair_transfers:
+            self.budget_transactions = results[2]
+
+        self._results.clear()
+        return self.ynab_transactions
+
+    def load_pipelined(self, since_date: Optional[str] = None, pair_transfers: bool = False):
+        """
+        Parse the Chase export while YNAB is fetched in background threads.
+
+        Without since_date, the fetch starts from the earliest date found by a
+        quick scan of the export's first and last rows. If the full parse then
+        finds an earlier date, the transactions are fetched again from it, so
+        the result is the same as load().
+
+        Args:
+            since_date: Optional date in YYYY-MM-DD format (defaults to the earliest Chase date)
+            pair_transfers: Also fetch every account's transactions to pair transfers against
+        """
+        guessed = since_date
+        if guessed is None:
+            with self.profiler.stage("scan_chase"):
+                earliest, _ = quick_date_range(self.chase_path)
+            if earliest is None:
+                # Nothing to start the fetch from, so don't overlap
+                self.load(since_date=since_date, pair_transfers=pair_transfers)
+                return
+            guessed = earliest.strftime('%Y-%m-%d')
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            fetch = pool.submit(self.load_ynab, since_date=guessed, pair_transfers=pair_transfers, concurrent=True)
+            try:
+                self.load_chase()
+            finally:
+                fetch.result()
+
+        if since_date is None and self.date_range[0].strftime('%Y-%m-%d') < guessed:
+            self.load_ynab(pair_transfers=pair_transfers, concurrent=True)
+
+    def load_ynab_since_reconciled(
+        self,
+        state: ReconcileState,
+        pair_transfers: bool = False,
+        margin_days: int = 0
+    ) -> Optional[datetime]:
+        """
+        Fetch only YNAB transactions after the account's reconciled point.
+
+        The fetch starts at the later of the earliest Chase date and the day
+        after the saved point, so an export that starts long after the point
+        doesn't pull in (and report) everything in between. The first run
+        learns the point from the reconciled transactions YNAB returns. Chase
+        is then restricted to dates after the point, and the state is saved.
+        YNAB rows in the margin before the point are kept as match candidates
+        but never reported as unmatched.
+
+        Args:
+            state: ReconcileState holding the per-account reconciled points
+            pair_transfers: Also fetch every account's transactions to pair transfers against
+            margin_days: Also keep YNAB transactions this many days before the
+                start (usually the date tolerance), so Chase rows just after it
+                can still find their matches
+
+        Returns:
+            The reconciled point, or None if nothing is reconciled yet
+        """
+        start = self.date_range[0]
+        known = state.get(self.budget_name, self.account_name)
+        if known and known + timedelta(days=1) > start:
+            start = known + timedelta(days=1)
+        margin = timedelta(days=margin_days)
+        self.load_ynab(since_date=(start - margin).strftime('%Y-%m-%d'), pair_transfers=pair_transfers)
+        self.report_from = start
+
+        point = state.update(self.budget_name, self.account_name, self.ynab_transactions)
+        state.save()
+        if point:
+            self.exclude_before_reconciled(point, margin_days=margin_days)
+            # The trimmed rows weren't deleted in YNAB, so keep them in a history store
+            self.since_date = max(self.since_date, (point + timedelta(days=1) - margin).strftime('%Y-%m-%d'))
+            if not self.chase_transactions:
+                raise ValueError(
+                    f"Every Chase transaction is on or before the last reconciled date ({point.strftime('%Y-%m-%d')})"
+                )
+        return point
+
+    def exclude_before_reconciled(self, point: datetime, margin_days: int = 0):
+        """
+        Compare only the transactions after a reconciled point.
+
+        Args:
+            point: Last reconciled date
+            margin_days: Keep YNAB rows this many days before the point as
+                match candidates (they are never reported as unmatched)
+        """
+        self.chase_transactions = [t for t in self.chase_transactions if t.date > point]
+        self.ynab_transactions = [t for t in self.ynab_transactions if t.date > point - timedelta(days=margin_days)]
+        after = point + timedelta(days=1)
+        self.report_from = max(self.report_from, after) if self.report_from else after
+        self._results.clear()
+
+    def sync_ynab(self, margin_days: int = 0, date_from: Optional[datetime] = None) -> int:
+        """
+        Bring the YNAB transactions up to date with a delta request.
+
+        The account's transactions are cached by ID across calls. The first
+        call fetches everything since the earliest Chase date; later calls only
+        ask YNAB for what changed since the previous server_knowledge, unless
+        the Chase data now starts before the cached range. Afterwards
+        ynab_transactions holds the cached rows from margin_days before the
+        earliest Chase date (or date_from), the same rows compare.py reports
+        on plus the margin; rows in the margin are match candidates only.
+
+        Args:
+            margin_days: Extra days before the earliest Chase date to match against
+            date_from: Report YNAB rows from this date instead of the earliest Chase date
+
+        Returns:
+            Number of transactions added, changed or deleted by this sync
+        """
+        start = date_from or self.date_range[0]
+        fetch_from = start - timedelta(days=margin_days)
+        since_date = fetch_from.strftime('%Y-%m-%d')
+
+        with self.profiler.stage("fetch_ynab"):
+            self.connect()
+
+            if self.since_date is None or since_date < self.since_date:
+                # Nothing cached for these dates yet
+                self._ynab_cache.clear()
+                self.server_knowledge = None
+                self.since_date = since_date
+
+            with self.profiler.stage("ynab_delta"):
+                changed, self.server_knowledge = self.client.get_transactions_delta(
+                    self.budget_id,
+                    self.account_id,
+                    last_knowledge_of_server=self.server_knowledge,
+                    since_date=self.since_date
+                )
+            for trans in changed:
+                if trans.deleted:
+                    self._ynab_cache.pop(trans.transaction_id, None)
+                else:
+                    self._ynab_cache[trans.transaction_id] = trans
+
+            with self.profiler.stage("ynab_balance"):
+                self.ynab_balance = self.client.get_account_balance(self.budget_id, self.account_id)
+
+        self.ynab_transactions = sorted(
+            (t for t in self._ynab_cache.values() if t.date >= fetch_from),
+            key=lambda t: t.date
+        )
+        self.report_from = start
+        self._results.clear()
+        return len(changed)
+
+    def load(self, since_date: Optional[str] = None, pair_transfers: bool = False):
+        """Parse the Chase export and fetch the YNAB data."""
+        self.load_chase()
+        self.load_ynab(since_date=since_date, pair_transfers=pair_transfers)
+
+    def load_chase_from_store(
+        self,
+        store: "HistoryStore",
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> List[ChaseTransaction]:
+        """Read Chase history for a date range from a store instead of a CSV export."""
+        with self.profiler.stage("store_read"):
+            self.chase_transactions = store.load_chase(self.account_name, date_from, date_to)
+        if not self.chase_transactions:
+            raise ValueError("No Chase transactions in the store for this date range")
+        return self.chase_transactions
+
+    def save_to_store(self, store: "HistoryStore"):
+        """Add the loaded Chase and YNAB transactions to a history store."""
+        with self.profiler.stage("store_write"):
+            if self.chase_path:
+                store.ingest_chase(self.account_name, self.chase_transactions)
+            store.ingest_ynab(self.account_name, self.ynab_transactions, since_date=self.since_date)
+
+    def load_from_store(
+        self,
+        store: "HistoryStore",
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        skip_agreeing_months: bool = False
+    ) -> List[str]:
+        """
+        Replace both sides with the store's history for a date range.
+
+        Only the month partitions overlapping the range are read.
+
+        Args:
+            store: HistoryStore holding both sources
+            date_from: Optional start date
+            date_to: Optional end date
+            skip_agreeing_months: Leave out months whose Chase and YNAB row
+                counts and sums already agree
+
+        Returns:
+            Skipped months ("YYYY-MM")
+        """
+        with self.profiler.stage("store_read"):
+            skipped = store.agreeing_months(self.account_name, date_from, date_to) if skip_agreeing_months else []
+            self.chase_transactions = store.load_chase(self.account_name, date_from, date_to, skip_months=skipped)
+            self.ynab_transactions = store.load_ynab(self.account_name, date_from, date_to, skip_months=skipped)
+        self.report_from = None
+        self._results.clear()
+        return skipped
+
+    @property
+    def date_range(self) -> Tuple[datetime, datetime]:
+        """Earliest and latest Chase transaction dates."""
+        dates = [t.date for t in self.chase_transactions]
+        return min(dates), max(dates)
+
+    @property
+    def chase_balance(self) -> Decimal:
+        """Balance from the most recent row of the Chase export."""
+        return self.chase_transactions[0].balance if self.chase_transactions else Decimal("0")
+
+    def filter_dates(self, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+        """Restrict both sides to a date range."""
+        if date_from:
+            self.chase_transactions = [t for t in self.chase_transactions if t.date >= date_from]
+            self.ynab_transactions = [t for t in self.ynab_transactions if t.date >= date_from]
+
+        if date_to:
+            self.chase_transactions = [t for t in self.chase_transactions if t.date <= date_to]
+            self.ynab_transactions = [t for t in self.ynab_transactions if t.date <= date_to]
+
+        self._results.clear()
+
+    def exclude_reconciled(self):
+        """Drop reconciled YNAB transactions and those after the Chase export."""
+        latest_date = self.date_range[1]
+        self.ynab_transactions = [
+            t for t in self.ynab_transactions
+            if t.cleared != "reconciled" and t.date <= latest_date
+        ]
+        self.unreconciled_only = True
+        self._results.clear()
+
+    def run(self, strategy: str = "fuzzy", tolerance_days: Optional[int] = None) -> MatchResult:
+        """
+        Run a matching strategy on the loaded data.
+
+        Results are cached, so rendering several reports for the same strategy
+        only matches once.
+
+        Args:
+            strategy: One of "fuzzy", "exact" or "window"
+            tolerance_days: Date tolerance (defaults to the strategy's own default)
+
+        Returns:
+            MatchResult for the strategy
+        """
+        if strategy not in STRATEGY_TOLERANCE_DAYS:
+            raise ValueError(f"Unknown matching strategy '{strategy}'")
+        if tolerance_days is None:
+            tolerance_days = STRATEGY_TOLERANCE_DAYS[strategy]
+
+        key = (strategy, tolerance_days)
+        if key in self._results:
+            return self._results[key]
+
+        with self.profiler.stage(f"match_{strategy}"):
+            matches, unmatched_chase, unmatched_ynab = self._match(strategy, tolerance_days)
+        if self.report_from:
+            unmatched_ynab = [t for t in unmatched_ynab if t.date >= self.report_from]
+
+        # Transfers between YNAB accounts never appear in the bank statement
+        transfer_pairs = []
+        if self.pair_transfers:
+            unmatched_ynab, transfer_pairs = exclude_transfers(
+                unmatched_ynab,
+                self.account_id,
+                self.budget_transactions
+            )
+
+        result = MatchResult(strategy, tolerance_days, matches, unmatched_chase, unmatched_ynab, transfer_pairs)
+        self._results[key] = result
+        return result
+
+    def _match(self, strategy: str, tolerance_days: int):
+        """Dispatch to the matching function for a strategy."""
+        if strategy == "exact":
+            return exact_match(self.chase_transactions, self.ynab_transactions)
+        if strategy == "window":
+            return window_match(self.chase_transactions, self.ynab_transactions, tolerance_days=tolerance_days)
+
+        if self.jobs is not None:
+            # Process pools are only loaded when --jobs asks for them
+            from parallel_match import parallel_match_transactions
+
+            return parallel_match_transactions(
+                self.chase_transactions,
+                self.ynab_transactions,
+                tolerance_days=tolerance_days,
+                jobs=self.jobs
+            )
+
+        matcher = TransactionMatcher(tolerance_days=tolerance_days)
+        return matcher.match_transactions(self.chase_transactions, self.ynab_transactions)
+
+
+class Reconciliation:
+    """Balances and matching outcome for one account, as returned by reconcile()."""
+
+    def __init__(
+        self,
+        budget_name: str,
+        account_name: str,
+        date_range: Tuple[datetime, datetime],
+        chase_balance: Decimal,
+        ynab_balance: Decimal,
+        result: MatchResult
+    ):
+        self.budget_name = budget_name
+        self.account_name = account_name
+        self.date_range = date_range
+        self.chase_balance = chase_balance
+        self.ynab_balance = ynab_balance
+        self.result = result
+
+    @property
+    def difference(self) -> Decimal:
+        return self.chase_balance - self.ynab_balance
+
+    @property
+    def reconciled(self) -> bool:
+        """True when the balances agree and every transaction matched."""
+        return (
+            self.difference == 0
+            and not self.result.unmatched_chase
+            and not self.result.unmatched_ynab
+        )
+
+    def summary(self) -> Dict:
+        """Counts and balances as a JSON-serializable dict."""
+        return {
+            "budget": self.budget_name,
+            "account": self.account_name,
+            "strategy": self.result.strategy,
+            "tolerance_days": self.result.tolerance_days,
+            "date_from": self.date_range[0].strftime('%Y-%m-%d'),
+            "date_to": self.date_range[1].strftime('%Y-%m-%d'),
+            "chase_balance": float(self.chase_balance),
+            "ynab_balance": float(self.ynab_balance),
+            "difference": float(self.difference),
+            "matched": len(self.result.matches),
+            "unmatched_chase": len(self.result.unmatched_chase),
+            "unmatched_ynab": len(self.result.unmatched_ynab),
+            "reconciled": self.reconciled,
+        }
+
+    def __repr__(self):
+        return f"Reconciliation(account='{self.account_name}', difference={self.difference}, {self.result!r})"
+
+
+def reconcile(
+    chase_path: str,
+    ynab_token: str,
+    budget_name: str,
+    account_name: str,
+    strategy: str = "fuzzy",
+    tolerance_days: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    base_url: Optional[str] = None,
+    max_retries: int = 0,
+    session: Optional[ReconciliationSession] = None
+) -> Reconciliation:
+    """
+    Compare a Chase export with a YNAB account and return the outcome without printing.
+
+    Pass the same ReconciliationSession to repeated calls to reuse its YNAB
+    client, budget and account IDs, parsed exports and cached YNAB
+    transactions; later calls then only fetch what changed in YNAB.
+
+    Args:
+        chase_path: Path to the Chase CSV export
+        ynab_token: YNAB Personal Access Token
+        budget_name: Name of the YNAB budget
+        account_name: Name of the YNAB account to compare
+        strategy: One of "fuzzy", "exact" or "window"
+        tolerance_days: Date tolerance (defaults to the strategy's own default)
+        date_from: Optional start date
+        date_to: Optional end date
+        base_url: Optional YNAB API root
+        max_retries: Number of times to retry 429 and 5xx responses
+        session: Optional ReconciliationSession for the same budget and account to reuse
+
+    Returns:
+        Reconciliation with the balances and MatchResult
+    """
+    if strategy not in STRATEGY_TOLERANCE_DAYS:
+        raise ValueError(f"Unknown matching strategy '{strategy}'")
+    if tolerance_days is None:
+        tolerance_days = STRATEGY_TOLERANCE_DAYS[strategy]
+
+    if session is None:
+        session = ReconciliationSession(
+            chase_path,
+            ynab_token,
+            budget_name,
+            account_name,
+            max_retries=max_retries,
+            base_url=base_url
+        )
+    session.chase_path = chase_path
+
+    session.load_chase()
+    if date_from or date_to:
+        session.filter_dates(date_from, date_to)
+        if not session.chase_transactions:
+            raise ValueError("No Chase transactions in the date range")
+    # Report the same YNAB rows as compare.py with --date-from
+    session.sync_ynab(margin_days=tolerance_days, date_from=date_from)
+    if date_from or date_to:
+        session.filter_dates(date_from, date_to)
+
+    result = session.run(strategy, tolerance_days=tolerance_days)
+    return Reconciliation(
+        session.budget_name,
+        session.account_name,
+        session.date_range,
+        session.chase_balance,
+        session.ynab_balance,
+        result
+    )
@@ -0,0 +1,222 @@
+"""Evaluate every date tolerance from 0 to N days for a matching strategy."""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from chase_parser import ChaseTransaction
+from exact_match import to_cents
+from ynab_client import YNABTransaction
+
+# Strategies whose results depend on the date tolerance
+SWEEP_STRATEGIES = ["fuzzy", "window"]
+
+# TransactionMatcher's default amount tolerance
+AMOUNT_TOLERANCE = Decimal("0.01")
+
+
+class ToleranceResult:
+    """Matching outcome for a single date tolerance."""
+
+    def __init__(
+        self,
+        tolerance_days: int,
+        matched: int,
+        unmatched_chase: int,
+        unmatched_ynab: int,
+        unmatched_chase_total: Decimal,
+        unmatched_ynab_total: Decimal
+    ):
+        self.tolerance_days = tolerance_days
+        self.matched = matched
+        self.unmatched_chase = unmatched_chase
+        self.unmatched_ynab = unmatched_ynab
+        self.unmatched_chase_total = unmatched_chase_total
+        self.unmatched_ynab_total = unmatched_ynab_total
+
+    def __repr__(self):
+        return (
+            f"ToleranceResult(days={self.tolerance_days}, matched={self.matched}, "
+            f"unmatched_chase={self.unmatched_chase}, unmatched_ynab={self.unmatched_ynab})"
+        )
+
+
+def _candidates(
+    chase_transactions: List[ChaseTransaction],
+    ynab_transactions: List[YNABTransaction],
+    max_days: int,
+    signed: bool
+) -> List[List[Tuple[int, int]]]:
+    """
+    YNAB rows each Chase row could match within max_days.
+
+    YNAB rows are bucketed by cents (absolute or signed) and sorted by date,
+    so each Chase row only looks at the neighbouring cent buckets within the
+    date window. Each strategy's own amount test is then applied exactly.
+
+    Returns:
+        For each Chase row, (ynab_position, date_difference_in_days) pairs in YNAB list order
+    """
+    def key(amount: Decimal) -> int:
+        cents = to_cents(amount)
+        return cents if signed else abs(cents)
+
+    ynab_ordinals = [t.date.toordinal() for t in ynab_transactions]
+    buckets: Dict[int, List[int]] = {}
+    for j, trans in enumerate(ynab_transactions):
+        buckets.setdefault(key(trans.amount), []).append(j)
+    bucket_dates = {}
+    for cents, positions in buckets.items():
+        positions.sort(key=lambda j: ynab_ordinals[j])
+        bucket_dates[cents] = [ynab_ordinals[j] for j in positions]
+
+    candidates = []
+    for chase_trans in chase_transactions:
+        ordinal = chase_trans.date.toordinal()
+        cents = key(chase_trans.amount)
+        found = []
+        for bucket in (cents - 1, cents, cents + 1):
+            positions = buckets.get(bucket)
+            if not positions:
+                continue
+            dates = bucket_dates[bucket]
+            lo = bisect_left(dates, ordinal - max_days)
+            hi = bisect_right(dates, ordinal + max_days)
+            for k in range(lo, hi):
+                ynab_trans = ynab_transactions[positions[k]]
+                # The same amount tests as window_match and TransactionMatcher
+                if signed:
+                    if abs(float(chase_trans.amount) - float(ynab_trans.amount)) >= 0.01:
+                        continue
+                elif abs(abs(chase_trans.amount) - abs(ynab_trans.amount)) > AMOUNT_TOLERANCE:
+                    continue
+                found.append((positions[k], abs(dates[k] - ordinal)))
+        found.sort()
+        candidates.append(found)
+    return candidates
+
+
+def _fuzzy_sweep(candidates: List[List[Tuple[int, int]]], max_days: int) -> List[List[int]]:
+    """
+    YNAB position each Chase row matches at every tolerance (-1 for none).
+
+    TransactionMatcher takes the first YNAB row in list order within the
+    tolerance and never uses a row up, so each Chase row's match at
+    tolerance N is the lowest position among its candidates within N days.
+    """
+    matches = [[-1] * len(candidates) for _ in range(max_days + 1)]
+    for i, found in enumerate(candidates):
+        first_by_days = [-1] * (max_days + 1)
+        for j, days in found:
+            if first_by_days[days] == -1:
+                first_by_days[days] = j
+        best = -1
+        for days in range(max_days + 1):
+            if first_by_days[days] != -1 and (best == -1 or first_by_days[days] < best):
+                best = first_by_days[days]
+            matches[days][i] = best
+    return matches
+
+
+def _window_sweep(candidates: List[List[Tuple[int, int]]], max_days: int) -> List[List[int]]:
+    """
+    YNAB position each Chase row matches at every tolerance (-1 for none).
+
+    window_match gives each Chase row, in order, the first unused YNAB row
+    in list order within the tolerance. Because rows are used up, the
+    tolerances are replayed one by one over the precomputed candidates.
+    """
+    matches = []
+    for tolerance in range(max_days + 1):
+        used = set()
+        row = []
+        for found in candidates:
+            match = -1
+            for j, days in found:
+                if days <= tolerance and j not in used:
+                    match = j
+                    used.add(j)
+                    break
+            row.append(match)
+        matches.append(row)
+    return matches
+
+
+def sweep_tolerances(
+    chase_transactions: List[ChaseTransaction],
+    ynab_transactions: List[YNABTransaction],
+    max_days: int,
+    strategy: str = "fuzzy",
+    report_from: Optional[datetime] = None
+) -> List[ToleranceResult]:
+    """
+    Compute match statistics for every tolerance from 0 to max_days.
+
+    The counts and totals at each tolerance are the same as running the
+    strategy with that --tolerance-days, but the candidate pairs are only
+    found once.
+
+    Args:
+        chase_transactions: List of Chase transactions
+        ynab_transactions: List of YNAB transactions
+        max_days: Largest tolerance to evaluate
+        strategy: "fuzzy" or "window"
+        report_from: YNAB rows dated before this are match candidates only
+            and aren't counted as unmatched
+
+    Returns:
+        List of ToleranceResult objects, one per tolerance
+    """
+    if strategy not in SWEEP_STRATEGIES:
+        raise ValueError(f"Can't sweep the '{strategy}' strategy; it doesn't use a date tolerance")
+
+    candidates = _candidates(chase_transactions, ynab_transactions, max_days, signed=strategy == "window")
+    sweep = _fuzzy_sweep if strategy == "fuzzy" else _window_sweep
+
+    reported = {
+        j for j, trans in enumerate(ynab_transactions)
+        if report_from is None or trans.date >= report_from
+    }
+    chase_total = sum((t.amount for t in chase_transactions), Decimal("0"))
+    ynab_total = sum((ynab_transactions[j].amount for j in reported), Decimal("0"))
+
+    results = []
+    for days, matches in enumerate(sweep(candidates, max_days)):
+        matched_chase_total = Decimal("0")
+        matched_count = 0
+        for chase_trans, j in zip(chase_transactions, matches):
+            if j != -1:
+                matched_count += 1
+                matched_chase_total += chase_trans.amount
+        matched_ynab = {j for j in matches if j in reported}
+        matched_ynab_total = sum((ynab_transactions[j].amount for j in matched_ynab), Decimal("0"))
+
+        results.append(ToleranceResult(
+            tolerance_days=days,
+            matched=matched_count,
+            unmatched_chase=len(chase_transactions) - matched_count,
+            unmatched_ynab=len(reported) - len(matched_ynab),
+            unmatched_chase_total=chase_total - matched_chase_total,
+            unmatched_ynab_total=ynab_total - matched_ynab_total
+        ))
+
+    return results
+
+
+def print_sweep(results: List[ToleranceResult], strategy: str = "fuzzy"):
+    """Print tolerance sweep results as a table."""
+    print("\n" + "=" * 80)
+    print(f"DATE TOLERANCE SWEEP ({strategy})")
+    print("=" * 80)
+    print(
+        f"{'Days':>4} | {'Matched':>8} | {'Chase only':>10} | {'YNAB only':>10} | "
+        f"{'Chase only $':>14} | {'YNAB only $':>14}"
+    )
+    print("-" * 80)
+    for result in results:
+        print(
+            f"{result.tolerance_days:>4} | {result.matched:>8} | {result.unmatched_chase:>10} | "
+            f"{result.unmatched_ynab:>10} | ${result.unmatched_chase_total:>13,.2f} | "
+            f"${result.unmatched_ynab_total:>13,.2f}"
+        )
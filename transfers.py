@@ -0,0 +1,97 @@
+"""Pair transfers between YNAB accounts so they aren't reported as discrepancies."""
+
+from typing import Dict, List, Set, Tuple
+
+from exact_match import to_cents
+from ynab_client import YNABTransaction
+
+
+class TransferMatcher:
+    """Find both legs of transfers across all accounts in a budget."""
+
+    def _is_pair(self, trans: YNABTransaction, other: YNABTransaction) -> bool:
+        """Check whether YNAB links two transactions as the two legs of one transfer."""
+        if trans.transfer_transaction_id != other.transaction_id:
+            return False
+        if other.transfer_transaction_id != trans.transaction_id:
+            return False
+        # The legs must be in the accounts each one names
+        if trans.transfer_account_id and other.account_id and trans.transfer_account_id != other.account_id:
+            return False
+        if other.transfer_account_id and trans.account_id and other.transfer_account_id != trans.account_id:
+            return False
+        return to_cents(trans.amount) == -to_cents(other.amount)
+
+    def find_pairs(
+        self,
+        transactions: List[YNABTransaction]
+    ) -> List[Tuple[YNABTransaction, YNABTransaction]]:
+        """
+        Pair transactions that are two sides of the same transfer.
+
+        This is a single pass hash join on YNAB's transfer metadata: each
+        transaction is looked up by its transfer_transaction_id, and only
+        legs that point at each other are paired. Rows that merely look
+        alike (opposite amounts on nearby dates) are never paired, since
+        that would hide genuine discrepancies. Transactions left unpaired
+        are added to the table for later transactions to find.
+
+        Args:
+            transactions: Unmatched transactions from every account in the budget
+
+        Returns:
+            List of (first_leg, second_leg) tuples
+        """
+        pairs = []
+        pending_by_id: Dict[str, YNABTransaction] = {}
+        paired_ids: Set[str] = set()
+
+        for trans in transactions:
+            if not trans.transfer_transaction_id or trans.transaction_id in paired_ids:
+                continue
+
+            partner = pending_by_id.get(trans.transfer_transaction_id)
+            if partner is not None and partner.transaction_id not in paired_ids and self._is_pair(trans, partner):
+                pairs.append((partner, trans))
+                paired_ids.add(partner.transaction_id)
+                paired_ids.add(trans.transaction_id)
+                continue
+
+            pending_by_id[trans.transaction_id] = trans
+
+        return pairs
+
+
+def exclude_transfers(
+    unmatched_ynab: List[YNABTransaction],
+    account_id: str,
+    budget_transactions: List[YNABTransaction]
+) -> Tuple[List[YNABTransaction], List[Tuple[YNABTransaction, YNABTransaction]]]:
+    """
+    Remove transfers to or from other budget accounts from the unmatched list.
+
+    Args:
+        unmatched_ynab: Unmatched YNAB transactions for the compared account
+        account_id: The compared account ID
+        budget_transactions: Transactions for every account in the budget
+
+    Returns:
+        Tuple of (remaining_unmatched, transfer_pairs)
+    """
+    # Make sure the compared account's transactions carry their account ID
+    for trans in unmatched_ynab:
+        if trans.account_id is None:
+            trans.account_id = account_id
+
+    other_accounts = [t for t in budget_transactions if t.account_id != account_id]
+    pairs = TransferMatcher().find_pairs(unmatched_ynab + other_accounts)
+
+    unmatched_ids = {t.transaction_id for t in unmatched_ynab}
+    transfer_pairs = [
+        (a, b) for a, b in pairs
+        if a.transaction_id in unmatched_ids or b.transaction_id in unmatched_ids
+    ]
+    paired_ids = {t.transaction_id for pair in transfer_pairs for t in pair}
+    remaining = [t for t in unmatched_ynab if t.transaction_id not in paired_ids]
+
+    return remaining, transfer_pairs
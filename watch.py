@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Watch a directory for new Chase exports and reconcile each one as it lands.
+
+The process stays up between exports, so the YNAB budget and account IDs
+and the account's transactions stay in memory. Each new CSV is parsed on
+its own, YNAB is asked only for what changed since the last sync, and the
+matching runs only over the new export's date range.
+
+    python watch.py --data-dir data --results-dir data/results
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from chase_parser import find_exports
+from output_formats import FORMATS, open_writer, write_result
+from session import ReconciliationSession, STRATEGY_TOLERANCE_DAYS
+
+
+class ExportWatcher:
+    """Poll a directory for new or changed CSV exports and reconcile them."""
+
+    def __init__(
+        self,
+        session: ReconciliationSession,
+        data_dir: str,
+        results_dir: str,
+        strategy: str = "fuzzy",
+        tolerance_days: Optional[int] = None,
+        fmt: str = "jsonl",
+        settle_seconds: float = 1.0
+    ):
+        """
+        Args:
+            session: ReconciliationSession used for every export (keeps YNAB data warm)
+            data_dir: Directory to watch for CSV exports (*.csv or *.CSV)
+            results_dir: Directory to write one result file per export to
+            strategy: Matching strategy to run
+            tolerance_days: Date tolerance (defaults to the strategy's own default)
+            fmt: Result file format, one of output_formats.FORMATS
+            settle_seconds: Ignore files modified more recently than this, so
+                exports still being copied aren't read half-written
+        """
+        self.session = session
+        self.data_dir = data_dir
+        self.results_dir = results_dir
+        self.strategy = strategy
+        self.tolerance_days = STRATEGY_TOLERANCE_DAYS[strategy] if tolerance_days is None else tolerance_days
+        self.fmt = fmt
+        self.settle_seconds = settle_seconds
+        self.seen: Dict[str, Tuple[float, int]] = {}
+
+    def _stat(self, path: str) -> Tuple[float, int]:
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    def mark_existing(self):
+        """Treat the exports already in the directory as processed."""
+        for path in find_exports(self.data_dir):
+            try:
+                self.seen[path] = self._stat(path)
+            except FileNotFoundError:
+                continue
+
+    def scan(self) -> List[str]:
+        """Return exports that are new or changed since they were last processed."""
+        now = time.time()
+        pending = []
+        for path in find_exports(self.data_dir):
+            try:
+                stat = self._stat(path)
+            except FileNotFoundError:
+                continue
+            if self.seen.get(path) == stat or now - stat[0] < self.settle_seconds:
+                continue
+            pending.append(path)
+        return pending
+
+    def result_path(self, path: str) -> str:
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.results_dir, f"{name}.{self.fmt}")
+
+    def process(self, path: str) -> str:
+        """
+        Reconcile one export and write its results.
+
+        Returns:
+            Path of the result file
+        """
+        session = self.session
+        start = time.perf_counter()
+        stat = self._stat(path)
+
+        session.chase_path = path
+        session.load_chase()
+        changed = session.sync_ynab(margin_days=self.tolerance_days)
+        result = session.run(self.strategy, tolerance_days=self.tolerance_days)
+
+        os.makedirs(self.results_dir, exist_ok=True)
+        out_path = self.result_path(path)
+        with session.profiler.stage(f"write_{self.fmt}"):
+            with open_writer(self.fmt, out_path) as writer:
+                write_result(writer, session, result)
+
+        self.seen[path] = stat
+        earliest, latest = session.date_range
+        print(
+            f"{os.path.basename(path)}: {earliest.strftime('%Y-%m-%d')} to {latest.strftime('%Y-%m-%d')}, "
+            f"{len(result.matches)} matched, {len(result.unmatched_chase)} missing in YNAB, "
+            f"{len(result.unmatched_ynab)} missing in Chase "
+            f"({changed} YNAB changes, {time.perf_counter() - start:.2f}s) -> {out_path}",
+            file=sys.stderr
+        )
+        return out_path
+
+    def poll(self) -> List[str]:
+        """Process every pending export once. Errors are reported and the export is retried next time it changes."""
+        written = []
+        for path in self.scan():
+            try:
+                written.append(self.process(path))
+            except Exception as e:
+                print(f"Error reconciling {path}: {e}", file=sys.stderr)
+                try:
+                    self.seen[path] = self._stat(path)
+                except FileNotFoundError:
+                    # Removed while it was being processed
+                    self.seen.pop(path, None)
+        return written
+
+    def run(self, interval: float = 2.0):
+        """Poll until interrupted."""
+        print(f"Watching {self.data_dir} for Chase exports (Ctrl+C to stop)...", file=sys.stderr)
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching", file=sys.stderr)
+
+
+def main():
+    """Main CLI entry point."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description="Watch a directory and reconcile new Chase exports against YNAB as they arrive"
+    )
+    parser.add_argument("--data-dir", default="data", help="Directory to watch for Chase CSV exports (default: data)")
+    parser.add_argument(
+        "--results-dir",
+        help="Directory to write one result file per export to (default: <data-dir>/results)"
+    )
+    parser.add_argument(
+        "--ynab-token",
+        default=os.getenv("YNAB_TOKEN"),
+        help="YNAB Personal Access Token (or set YNAB_TOKEN in .env)"
+    )
+    parser.add_argument(
+        "--budget-name",
+        default=os.getenv("BUDGET_NAME"),
+        help="Name of your YNAB budget (or set BUDGET_NAME in .env)"
+    )
+    parser.add_argument(
+        "--account-name",
+        default=os.getenv("ACCOUNT_NAME"),
+        help="Name of the YNAB account to compare (or set ACCOUNT_NAME in .env)"
+    )
+    parser.add_argument(
+        "--ynab-base-url",
+        default=os.getenv("YNAB_BASE_URL"),
+        help="YNAB API root, e.g. a local stand-in server (or set YNAB_BASE_URL in .env)"
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=sorted(STRATEGY_TOLERANCE_DAYS),
+        default="fuzzy",
+        help="Matching strategy to run (default: fuzzy)"
+    )
+    parser.add_argument(
+        "--tolerance-days",
+        type=int,
+        help="Number of days tolerance for date matching (default: the strategy's own default)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="jsonl",
+        help="Result file format (default: jsonl)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="Seconds between directory scans (default: 2)"
+    )
+    parser.add_argument(
+        "--process-existing",
+        action="store_true",
+        help="Also reconcile the exports already in the directory at startup"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retry rate-limited (429) and server error responses this many times (default: 3)"
+    )
+
+    args = parser.parse_args()
+
+    if not args.ynab_token:
+        print("Error: --ynab-token argument is required (or set YNAB_TOKEN in .env)", file=sys.stderr)
+        sys.exit(1)
+    if not args.budget_name:
+        print("Error: --budget-name argument is required (or set BUDGET_NAME in .env)", file=sys.stderr)
+        sys.exit(1)
+    if not args.account_name:
+        print("Error: --account-name argument is required (or set ACCOUNT_NAME in .env)", file=sys.stderr)
+        sys.exit(1)
+
+    session = ReconciliationSession(
+        None,
+        args.ynab_token,
+        args.budget_name,
+        args.account_name,
+        max_retries=args.max_retries,
+        base_url=args.ynab_base_url
+    )
+    watcher = ExportWatcher(
+        session,
+        args.data_dir,
+        args.results_dir or os.path.join(args.data_dir, "results"),
+        strategy=args.strategy,
+        tolerance_days=args.tolerance_days,
+        fmt=args.format
+    )
+
+    # Resolve the budget and account up front so configuration errors show immediately
+    try:
+        session.connect()
+    except Exception as e:
+        print(f"Error connecting to YNAB: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not args.process_existing:
+        watcher.mark_existing()
+    watcher.run(interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,192 @@
-"""Client for interacting with the YNAB API."""
+"""Client for interacting with the YNAB API.
 
-import requests
+`requests` is imported on first use so that parsing and matching code can
+import YNABTransaction without paying for the HTTP stack. Each client keeps
+one pooled requests.Session, so long-lived clients reuse connections.
+"""
+
+import os
+import time
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 
 
 class YNABTransaction:
     """Represents a YNAB transaction."""
 
-    def __init__(self, date: datetime, payee_name: str, amount: Decimal, memo: str, cleared: str, transaction_id: str):
+    def __init__(
+        self,
+        date: datetime,
+        payee_name: str,
+        amount: Decimal,
+        memo: str,
+        cleared: str,
+        transaction_id: str,
+        account_id: Optional[str] = None,
+        transfer_account_id: Optional[str] = None,
+        transfer_transaction_id: Optional[str] = None,
+        deleted: bool = False
+    ):
         self.date = date
         self.payee_name = payee_name
         self.amount = amount  # YNAB stores in milliunits (divide by 1000)
         self.memo = memo
         self.cleared = cleared
         self.transaction_id = transaction_id
+        self.account_id = account_id
+        # Set by YNAB when the transaction is one leg of a transfer between accounts
+        self.transfer_account_id = transfer_account_id
+        self.transfer_transaction_id = transfer_transaction_id
+        # Only set on transactions returned by a delta request
+        self.deleted = deleted
 
     def __repr__(self):
         return f"YNABTransaction(date={self.date.strftime('%Y-%m-%d')}, payee='{self.payee_name}', amount={self.amount})"
 
 
+class RequestEvent:
+    """Measurements for one HTTP request to the YNAB API, passed to on_request callbacks."""
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        status_code: Optional[int],
+        seconds: float,
+        response_bytes: int,
+        retries: int,
+        rate_limit_used: Optional[int] = None,
+        rate_limit_total: Optional[int] = None
+    ):
+        self.method = method
+        self.endpoint = endpoint  # Path template, e.g. /budgets/{budget_id}/accounts
+        self.status_code = status_code  # None if the request failed without a response
+        self.seconds = seconds
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.rate_limit_used = rate_limit_used
+        self.rate_limit_total = rate_limit_total
+
+    @property
+    def rate_limit_remaining(self) -> Optional[int]:
+        """Requests left in the current rate limit window, if the API reported it."""
+        if self.rate_limit_used is None or self.rate_limit_total is None:
+            return None
+        return self.rate_limit_total - self.rate_limit_used
+
+    def __repr__(self):
+        return f"RequestEvent({self.method} {self.endpoint}, status={self.status_code}, seconds={self.seconds:.3f})"
+
+
+# Path segment that follows each collection name in an endpoint template
+_ID_PLACEHOLDERS = {
+    "budgets": "{budget_id}",
+    "accounts": "{account_id}",
+    "transactions": "{transaction_id}",
+}
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replace IDs in an API path with placeholders, e.g. /budgets/{budget_id}/accounts."""
+    segments = endpoint.split("?", 1)[0].split("/")
+    for i in range(1, len(segments)):
+        placeholder = _ID_PLACEHOLDERS.get(segments[i - 1])
+        if placeholder and segments[i] and segments[i] not in _ID_PLACEHOLDERS:
+            segments[i] = placeholder
+    return "/".join(segments)
+
+
+def _parse_rate_limit(header: Optional[str]):
+    """Parse YNAB's X-Rate-Limit header ("36/200") into (used, total)."""
+    if not header or "/" not in header:
+        return None, None
+    used, total = header.split("/", 1)
+    try:
+        return int(used), int(total)
+    except ValueError:
+        return None, None
+
+
 class YNABClient:
     """Client for the YNAB API."""
 
     BASE_URL = "https://api.ynab.com/v1"
 
-    def __init__(self, access_token: str):
+    # Status codes worth retrying when max_retries > 0
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    # A write that fails with a 5xx may still have been committed, so writes
+    # are only retried when the server rejected them outright
+    WRITE_RETRY_STATUS_CODES = {429}
+
+    def __init__(
+        self,
+        access_token: str,
+        on_request: Optional[Callable[[RequestEvent], None]] = None,
+        max_retries: int = 0,
+        base_url: Optional[str] = None
+    ):
+        """
+        Args:
+            access_token: YNAB Personal Access Token
+            on_request: Optional callback receiving a RequestEvent after every request
+            max_retries: Number of times to retry rate-limited (429) responses, and
+                5xx responses to GET requests
+            base_url: API root to use instead of BASE_URL (or set YNAB_BASE_URL),
+                e.g. a local stand-in server for load testing
+        """
         self.access_token = access_token
+        self.base_url = (base_url or os.getenv("YNAB_BASE_URL") or self.BASE_URL).rstrip("/")
+        self.on_request = on_request
+        self.max_retries = max_retries
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
         }
+        self._http = None
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> Dict:
+        """Send a request, retrying if configured, and report it to on_request."""
+        if self._http is None:
+            import requests
+
+            # One pooled session per client, so repeated calls reuse connections
+            self._http = requests.Session()
+            self._http.headers.update(self.headers)
+
+        url = f"{self.base_url}{endpoint}"
+        retry_status_codes = self.RETRY_STATUS_CODES if method == "GET" else self.WRITE_RETRY_STATUS_CODES
+        retries = 0
+        response = None
+        start = time.perf_counter()
+        try:
+            while True:
+                response = self._http.request(method, url, **kwargs)
+                if response.status_code not in retry_status_codes or retries >= self.max_retries:
+                    break
+                retries += 1
+                retry_after = response.headers.get("Retry-After")
+                time.sleep(float(retry_after) if retry_after and retry_after.isdigit() else 0.5 * 2 ** retries)
+            response.raise_for_status()
+            return response.json()
+        finally:
+            if self.on_request:
+                used, total = _parse_rate_limit(response.headers.get("X-Rate-Limit") if response is not None else None)
+                self.on_request(RequestEvent(
+                    method=method,
+                    endpoint=endpoint_template(endpoint),
+                    status_code=response.status_code if response is not None else None,
+                    seconds=time.perf_counter() - start,
+                    response_bytes=len(response.content) if response is not None else 0,
+                    retries=retries,
+                    rate_limit_used=used,
+                    rate_limit_total=total
+                ))
 
     def _make_request(self, endpoint: str) -> Dict:
         """Make a request to the YNAB API."""
-        url = f"{self.BASE_URL}{endpoint}"
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", endpoint)
 
     def get_budgets(self) -> List[Dict]:
         """Get all budgets."""
@@ -88,24 +236,89 @@ class YNABClient:
             endpoint += f"?since_date={since_date}"
 
         data = self._make_request(endpoint)
-        transactions = []
+        return [
+            self._parse_transaction(trans)
+            for trans in data.get("data", {}).get("transactions", [])
+        ]
 
-        for trans in data.get("data", {}).get("transactions", []):
-            # YNAB amounts are in milliunits (1000 milliunits = 1 currency unit)
-            # Negative amounts in YNAB are outflows, positive are inflows
-            amount = Decimal(trans["amount"]) / 1000
+    def get_transactions_delta(
+        self,
+        budget_id: str,
+        account_id: str,
+        last_knowledge_of_server: Optional[int] = None,
+        since_date: Optional[str] = None
+    ) -> Tuple[List[YNABTransaction], int]:
+        """
+        Get the account's transactions that changed since an earlier request.
+
+        Args:
+            budget_id: The budget ID
+            account_id: The account ID
+            last_knowledge_of_server: server_knowledge returned by the previous call
+                (omit for a full fetch)
+            since_date: Optional date in YYYY-MM-DD format
+
+        Returns:
+            Tuple of (changed transactions, including deleted ones, new server_knowledge)
+        """
+        params = []
+        if since_date:
+            params.append(f"since_date={since_date}")
+        if last_knowledge_of_server is not None:
+            params.append(f"last_knowledge_of_server={last_knowledge_of_server}")
+
+        endpoint = f"/budgets/{budget_id}/accounts/{account_id}/transactions"
+        if params:
+            endpoint += "?" + "&".join(params)
+
+        data = self._make_request(endpoint).get("data", {})
+        transactions = [self._parse_transaction(trans) for trans in data.get("transactions", [])]
+        return transactions, data.get("server_knowledge", 0)
+
+    def get_budget_transactions(
+        self,
+        budget_id: str,
+        since_date: Optional[str] = None
+    ) -> List[YNABTransaction]:
+        """
+        Get transactions for every account in a budget with a single request.
+
+        Args:
+            budget_id: The budget ID
+            since_date: Optional date in YYYY-MM-DD format
+
+        Returns:
+            List of YNABTransaction objects (with account_id set)
+        """
+        endpoint = f"/budgets/{budget_id}/transactions"
+        if since_date:
+            endpoint += f"?since_date={since_date}"
+
+        data = self._make_request(endpoint)
+        return [
+            self._parse_transaction(trans)
+            for trans in data.get("data", {}).get("transactions", [])
+        ]
 
-            transaction = YNABTransaction(
-                date=datetime.strptime(trans["date"], "%Y-%m-%d"),
-                payee_name=trans.get("payee_name", ""),
-                amount=amount,
-                memo=trans.get("memo", ""),
-                cleared=trans.get("cleared", ""),
-                transaction_id=trans["id"]
-            )
-            transactions.append(transaction)
+    @staticmethod
+    def _parse_transaction(trans: Dict) -> YNABTransaction:
+        """Convert a transaction dict from the API into a YNABTransaction."""
+        # YNAB amounts are in milliunits (1000 milliunits = 1 currency unit)
+        # Negative amounts in YNAB are outflows, positive are inflows
+        amount = Decimal(trans["amount"]) / 1000
 
-        return transactions
+        return YNABTransaction(
+            date=datetime.strptime(trans["date"], "%Y-%m-%d"),
+            payee_name=trans.get("payee_name", ""),
+            amount=amount,
+            memo=trans.get("memo", ""),
+            cleared=trans.get("cleared", ""),
+            transaction_id=trans["id"],
+            account_id=trans.get("account_id"),
+            transfer_account_id=trans.get("transfer_account_id"),
+            transfer_transaction_id=trans.get("transfer_transaction_id"),
+            deleted=trans.get("deleted", False)
+        )
 
     def get_account_balance(self, budget_id: str, account_id: str) -> Decimal:
         """Get the current balance for an account."""
@@ -169,10 +382,7 @@ class YNABClient:
             }
         }
 
-        url = f"{self.BASE_URL}/budgets/{budget_id}/transactions"
-        response = requests.post(url, headers=self.headers, json=transaction_data)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", f"/budgets/{budget_id}/transactions", json=transaction_data)
 
     def delete_transaction(self, budget_id: str, transaction_id: str) -> Dict:
         """
@@ -185,7 +395,4 @@ class YNABClient:
         Returns:
             Response data
         """
-        url = f"{self.BASE_URL}/budgets/{budget_id}/transactions/{transaction_id}"
-        response = requests.delete(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        return self._request("DELETE", f"/budgets/{budget_id}/transactions/{transaction_id}")